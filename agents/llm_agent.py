@@ -9,28 +9,33 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 # Ensure project root is on sys.path so 'tools' is importable when run as script
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from tools.llm_client import LLMClient
+from tools import json_utils
+from tools.logging_setup import configure_logging
+from tools.time_utils import now_iso
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('/tmp/llm_agent.log')
-    ]
-)
+# stdout is shipped to CloudWatch; set LOCAL_LOG_FILE=1 to also write /tmp/llm_agent.log
+configure_logging('/tmp/llm_agent.log')
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _get_client(model: str) -> LLMClient:
+    """Reuse one LLMClient (and its HTTP connection pool) per model across invocations"""
+    return LLMClient(model=model)
+
+
 class LLMRuntime:
+    __slots__ = ("model", "client")
+
     def __init__(self, model: Optional[str] = None):
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        self.client = LLMClient(model=self.model)
+        self.client = _get_client(self.model)
 
     def respond(self, prompt: str, system: Optional[str] = None) -> str:
         return self.client.generate_text(prompt, system=system)
@@ -50,7 +55,7 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
         system = event.get("system")
         model = event.get("model")
         if not message:
-            return {"statusCode": 400, "body": json.dumps({"error": "message is required"})}
+            return {"statusCode": 400, "body": json_utils.dumps({"error": "message is required"})}
 
         runtime = LLMRuntime(model=model)
         output = runtime.respond(message, system=system)
@@ -58,15 +63,15 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
             "input": message,
             "output": output,
             "model": runtime.model,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "status": "success",
         }
-        return {"statusCode": 200, "body": json.dumps(result, ensure_ascii=False)}
+        return {"statusCode": 200, "body": json_utils.dumps(result)}
     except Exception as e:
         logger.error("LLM handler error: %s", str(e), exc_info=True)
         return {
             "statusCode": 500,
-            "body": json.dumps({"error": str(e), "type": type(e).__name__})
+            "body": json_utils.dumps({"error": str(e), "type": type(e).__name__})
         }
 
 
@@ -11,59 +11,86 @@ Medical Agent for Healthcare Service Management
 import json
 import logging
 import os
+import re
 import sys
+import uuid
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 # Ensure project root is on sys.path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from tools.llm_provider import get_llm_provider
+from tools.agent_pool import AgentPool
+from tools import json_utils
+from tools.keyword_matcher import KeywordMatcher
+from tools.logging_setup import configure_logging
+from tools.time_utils import now_iso
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('/tmp/medical_agent.log')
-    ]
-)
+# stdout is shipped to CloudWatch; set LOCAL_LOG_FILE=1 to also write /tmp/medical_agent.log
+configure_logging('/tmp/medical_agent.log')
 logger = logging.getLogger(__name__)
 
+# LLM 컨텍스트로 유지하는 대화 메시지 수 (사용자 + 어시스턴트)
+HISTORY_WINDOW = 10
+
+# 의료진 및 진료과 정보
+DEPARTMENTS = {
+    "내과": {"의사": "김내과", "전문분야": "당뇨, 고혈압, 감기", "예약가능": True},
+    "외과": {"의사": "이외과", "전문분야": "수술, 외상, 상처치료", "예약가능": True},
+    "소아과": {"의사": "박소아", "전문분야": "아동질환, 예방접종", "예약가능": True},
+    "산부인과": {"의사": "최산부", "전문분야": "임신, 출산, 부인과질환", "예약가능": True},
+    "정형외과": {"의사": "정정형", "전문분야": "관절, 근골격계", "예약가능": False},
+    "피부과": {"의사": "윤피부", "전문분야": "아토피, 여드름, 피부질환", "예약가능": True},
+    "안과": {"의사": "한안과", "전문분야": "시력, 안질환", "예약가능": True},
+    "이비인후과": {"의사": "코이비", "전문분야": "코, 목, 귀 질환", "예약가능": True}
+}
+
+# 키워드는 감지 결과 순서가 고정되도록 tuple로 유지
+EMERGENCY_KEYWORDS = (
+    "가슴이 아파", "숨이 막혀", "의식을 잃", "심한 출혈", "출혈",
+    "골절", "화상", "중독", "급성 복통", "119", "응급",
+    "쓰러져", "경련", "호흡곤란", "심장이 아파", "가슴이 너무 아파",
+    "숨도 잘 안 쉬어져", "숨쉬기 어려워", "가슴 통증", "배가 아파",
+    "배가 너무 아파", "갑자기 아파", "너무 아파"
+)
+HIGH_URGENCY_KEYWORDS = ("심한", "급성", "갑자기", "응급", "위험", "심각")
+MEDIUM_URGENCY_KEYWORDS = ("아파", "불편", "걱정", "며칠째")
 
-class MedicalAgent:
-    """의료 서비스 전문 AI 에이전트"""
+# 여러 값을 누적하는 환자 정보 항목
+PATIENT_LIST_FIELDS = ("symptoms", "allergies", "medications", "medical_history")
 
-    def __init__(self, session_id: str = None):
-        self.session_id = session_id or self._generate_session_id()
-        self.llm_provider = get_llm_provider()
-        self.conversation_history = []
-        self.patient_context = {}
-        
-        # 의료진 및 진료과 정보
-        self.departments = {
-            "내과": {"의사": "김내과", "전문분야": "당뇨, 고혈압, 감기", "예약가능": True},
-            "외과": {"의사": "이외과", "전문분야": "수술, 외상, 상처치료", "예약가능": True},
-            "소아과": {"의사": "박소아", "전문분야": "아동질환, 예방접종", "예약가능": True},
-            "산부인과": {"의사": "최산부", "전문분야": "임신, 출산, 부인과질환", "예약가능": True},
-            "정형외과": {"의사": "정정형", "전문분야": "관절, 근골격계", "예약가능": False},
-            "피부과": {"의사": "윤피부", "전문분야": "아토피, 여드름, 피부질환", "예약가능": True},
-            "안과": {"의사": "한안과", "전문분야": "시력, 안질환", "예약가능": True},
-            "이비인후과": {"의사": "코이비", "전문분야": "코, 목, 귀 질환", "예약가능": True}
-        }
-        
-        self.system_prompt = self._get_medical_system_prompt()
-        
-        logger.info(f"MedicalAgent initialized with session_id: {self.session_id}")
+# 응급/응급도 키워드를 하나의 매처로 묶어 메시지를 한 번만 스캔
+_MESSAGE_MATCHER = KeywordMatcher(EMERGENCY_KEYWORDS + HIGH_URGENCY_KEYWORDS + MEDIUM_URGENCY_KEYWORDS)
+_EMERGENCY_SET = frozenset(EMERGENCY_KEYWORDS)
+_HIGH_URGENCY_SET = frozenset(HIGH_URGENCY_KEYWORDS)
+_MEDIUM_URGENCY_SET = frozenset(MEDIUM_URGENCY_KEYWORDS)
 
-    def _generate_session_id(self) -> str:
-        """Generate unique session ID"""
-        import uuid
-        return f"medical_{uuid.uuid4().hex}"
 
-    def _get_medical_system_prompt(self) -> str:
-        """의료 전문 시스템 프롬프트"""
-        return f"""당신은 의료 서비스 전문 AI 어시스턴트입니다.
+@lru_cache(maxsize=1024)
+def _scan_message(message: str) -> Tuple[Tuple[str, ...], str]:
+    """메시지에서 응급 키워드와 응급도(high/medium/low)를 한 번의 스캔으로 계산
+
+    입력 문자열에 대한 순수 함수이므로 재시도 등으로 반복되는 메시지는 캐시에서 반환한다.
+    """
+    # 키워드가 모두 한글/숫자라 lower() 결과와 매칭이 같으므로 변환을 생략한다
+    found = _MESSAGE_MATCHER.find(message)
+    detected_keywords = tuple(kw for kw in found if kw in _EMERGENCY_SET)
+
+    if any(kw in _HIGH_URGENCY_SET for kw in found):
+        urgency = "high"
+    elif any(kw in _MEDIUM_URGENCY_SET for kw in found):
+        urgency = "medium"
+    else:
+        urgency = "low"
+
+    return detected_keywords, urgency
+
+
+# 의료 전문 시스템 프롬프트 (모듈 로드 시 한 번만 생성)
+MEDICAL_SYSTEM_PROMPT = """당신은 의료 서비스 전문 AI 어시스턴트입니다.
 
 **역할**: 병원 예약, 증상 상담, 진료과 안내를 담당하는 의료 서비스 도우미
 
@@ -75,7 +102,7 @@ class MedicalAgent:
 5. 예약 일정 관리 및 변경
 
 **진료과 정보**:
-{json.dumps(self.departments, ensure_ascii=False, indent=2)}
+{departments_json}
 
 **응답 원칙**:
 - 친근하고 전문적인 tone으로 응답
@@ -89,44 +116,137 @@ class MedicalAgent:
 - 처방전이나 약물 추천  
 - 의료진을 대체하려는 시도
 
-한국어로 따뜻하고 신뢰할 수 있는 응답을 제공하세요."""
+**환자 정보 기록**:
+응답 맨 끝에 지금까지 파악한 환자 정보를 아래 형식의 JSON으로 덧붙이세요. 이 블록은 시스템이 제거하므로 환자에게 보이지 않습니다. 정보가 없으면 null이나 빈 배열을 사용하세요.
+<patient_info>{{"age": null, "gender": null, "symptoms": [], "department": null, "urgency": "low", "allergies": [], "medications": [], "medical_history": []}}</patient_info>
+
+한국어로 따뜻하고 신뢰할 수 있는 응답을 제공하세요.""".format(
+    departments_json=json.dumps(DEPARTMENTS, ensure_ascii=False, indent=2)
+)
+
+# 응급상황 안내 문구 (메시지와 감지 키워드만 채워 넣음)
+EMERGENCY_RESPONSE_TEMPLATE = """🚨 응급상황이 의심됩니다!
+
+즉시 다음 조치를 취하세요:
+
+1️⃣ **119 신고** - 생명이 위험하다고 판단되면 즉시 119에 신고하세요
+2️⃣ **응급실 방문** - 가까운 응급실로 즉시 이동하세요  
+3️⃣ **안전한 자세** - 의식이 있다면 안전한 자세를 유지하세요
+
+📍 **24시간 응급실**:
+- 서울대병원 응급의료센터: 02-2072-2345
+- 삼성서울병원 응급실: 02-3410-2345  
+- 응급의료정보센터: 1339
+
+⚠️ 이 AI 상담은 응급치료를 대체할 수 없습니다. 즉시 전문 의료진의 도움을 받으세요!
+
+현재 증상: {message}
+감지된 응급 키워드: {keywords}"""
+
+# 응답 끝에 덧붙인 환자 정보 블록 (상담 응답과 정보 추출을 한 번의 호출로 처리)
+_PATIENT_INFO_RE = re.compile(r"<patient_info>(.*?)</patient_info>", re.DOTALL)
+
+
+def _split_patient_info(response: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """LLM 응답에서 환자 정보 블록을 분리해 (응답 본문, 환자 정보) 반환"""
+    match = _PATIENT_INFO_RE.search(response)
+    if match is None:
+        # max_tokens로 잘려 닫는 태그가 없는 블록은 끝까지 잘라내고 별도 추출로 대체
+        start = response.find("<patient_info>")
+        if start != -1:
+            return response[:start].strip(), None
+        return response, None
+
+    reply = (response[:match.start()] + response[match.end():]).strip()
+    try:
+        patient_info = json_utils.loads(match.group(1).strip())
+    except ValueError:
+        return reply, None
+    return reply, patient_info if isinstance(patient_info, dict) else None
+
+
+class MedicalAgent:
+    """의료 서비스 전문 AI 에이전트"""
+
+    __slots__ = (
+        "session_id", "llm_provider", "conversation_history", "system_prompt",
+        "_patient_fields", "_patient_sets", "_patient_context", "_patient_context_str",
+    )
+
+    departments = DEPARTMENTS
+
+    def __init__(self, session_id: str = None):
+        self.session_id = session_id or self._generate_session_id()
+        self.llm_provider = get_llm_provider()
+        self.conversation_history = deque(maxlen=HISTORY_WINDOW)
+        # 환자 정보: 단일 값 항목과 누적 항목(set)을 나눠 저장하고 patient_context에서 합침
+        self._patient_fields: Dict[str, Any] = {}
+        self._patient_sets: Dict[str, set] = {key: set() for key in PATIENT_LIST_FIELDS}
+        self._patient_context: Optional[Dict[str, Any]] = None  # patient_context 캐시
+        self._patient_context_str: Optional[str] = None  # patient_context 직렬화 캐시
+        self.system_prompt = MEDICAL_SYSTEM_PROMPT
+        
+        logger.info("MedicalAgent initialized with session_id: %s", self.session_id)
+
+    @property
+    def patient_context(self) -> Dict[str, Any]:
+        """누적된 환자 정보 (누적 항목은 필요할 때만 list로 변환)"""
+        if self._patient_context is None:
+            context = dict(self._patient_fields)
+            for key, values in self._patient_sets.items():
+                if values:
+                    context[key] = list(values)
+            self._patient_context = context
+        return self._patient_context
+
+    def _generate_session_id(self) -> str:
+        """Generate unique session ID"""
+        return f"medical_{uuid.uuid4().hex}"
 
     def process_message(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """의료 상담 메시지 처리"""
-        logger.info(f"Processing medical consultation: {message}")
+        logger.info("Processing medical consultation: %s", message)
 
         try:
             # 응급상황 우선 체크
-            emergency_check = self._check_emergency_symptoms(message)
-            if emergency_check["is_emergency"]:
-                return self._handle_emergency(message, emergency_check)
+            detected_keywords, urgency = _scan_message(message)
+            if detected_keywords:
+                return self._handle_emergency(message, self._emergency_info(detected_keywords))
 
-            # 대화 컨텍스트 구성
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # 환자 컨텍스트 추가
+            # 대화 컨텍스트 구성 (시스템 프롬프트, 환자 정보, 최근 10개 메시지, 현재 메시지를 한 번에 생성)
+            user_message = {"role": "user", "content": message}
             if self.patient_context:
-                context_str = f"환자 정보: {json.dumps(self.patient_context, ensure_ascii=False)}"
-                messages.append({"role": "system", "content": context_str})
-            
-            # 대화 히스토리 추가 (최근 10턴)
-            messages.extend(self.conversation_history[-10:])
-            
-            # 현재 메시지 추가
-            messages.append({"role": "user", "content": message})
-
-            # LLM 응답 생성
-            response = self.llm_provider.chat(
+                # 환자 정보가 바뀐 경우에만 다시 직렬화
+                if self._patient_context_str is None:
+                    self._patient_context_str = "환자 정보: " + json_utils.dumps(self.patient_context)
+                messages = [
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "system", "content": self._patient_context_str},
+                    *self.conversation_history,
+                    user_message,
+                ]
+            else:
+                messages = [
+                    {"role": "system", "content": self.system_prompt},
+                    *self.conversation_history,
+                    user_message,
+                ]
+
+            # LLM 응답 생성 (환자 정보 블록 포함)
+            response, patient_info = _split_patient_info(self.llm_provider.chat(
                 messages=messages,
                 temperature=0.3,  # 의료 상담이므로 일관성 중시
                 max_tokens=800
-            )
+            ))
 
-            # 의료 정보 추출 및 저장
-            self._extract_medical_info(message, response)
+            # 의료 정보 저장 (블록이 없을 때만 별도 추출 호출)
+            if patient_info is not None:
+                self._update_patient_context(patient_info)
+            else:
+                self._extract_medical_info(message, response)
 
             # 대화 히스토리 업데이트
-            self.conversation_history.append({"role": "user", "content": message})
+            self.conversation_history.append(user_message)
             self.conversation_history.append({"role": "assistant", "content": response})
 
             result = {
@@ -134,18 +254,18 @@ class MedicalAgent:
                 "input": message,
                 "output": response,
                 "department_recommended": self._extract_department_recommendation(response),
-                "urgency_level": self._assess_urgency(message),
+                "urgency_level": urgency,
                 "provider": self.llm_provider.provider_name,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "status": "success",
                 "medical_context": self.patient_context
             }
 
-            logger.info(f"Medical consultation completed successfully")
+            logger.info("Medical consultation completed successfully")
             return result
 
         except Exception as e:
-            logger.error(f"Error in medical consultation: {str(e)}")
+            logger.error("Error in medical consultation: %s", e)
             fallback_response = "죄송합니다. 일시적인 오류가 발생했습니다. 응급상황이시면 119에 신고하시고, 그렇지 않다면 잠시 후 다시 시도해 주세요."
             
             return {
@@ -153,48 +273,30 @@ class MedicalAgent:
                 "input": message,
                 "output": fallback_response,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "status": "error"
             }
 
     def _check_emergency_symptoms(self, message: str) -> Dict[str, Any]:
         """응급상황 키워드 체크"""
-        emergency_keywords = [
-            "가슴이 아파", "숨이 막혀", "의식을 잃", "심한 출혈", "출혈",
-            "골절", "화상", "중독", "급성 복통", "119", "응급",
-            "쓰러져", "경련", "호흡곤란", "심장이 아파", "가슴이 너무 아파",
-            "숨도 잘 안 쉬어져", "숨쉬기 어려워", "가슴 통증", "배가 아파",
-            "배가 너무 아파", "갑자기 아파", "너무 아파"
-        ]
-        
-        message_lower = message.lower()
-        detected_keywords = [kw for kw in emergency_keywords if kw in message_lower]
-        
+        detected_keywords, _ = _scan_message(message)
+        return self._emergency_info(detected_keywords)
+
+    @staticmethod
+    def _emergency_info(detected_keywords: Tuple[str, ...]) -> Dict[str, Any]:
+        """감지된 응급 키워드로 응급 정보 구성"""
         return {
             "is_emergency": len(detected_keywords) > 0,
-            "detected_keywords": detected_keywords,
+            "detected_keywords": list(detected_keywords),
             "urgency_score": min(len(detected_keywords) * 2, 10)
         }
 
     def _handle_emergency(self, message: str, emergency_info: Dict) -> Dict[str, Any]:
         """응급상황 처리"""
-        emergency_response = f"""🚨 응급상황이 의심됩니다!
-
-즉시 다음 조치를 취하세요:
-
-1️⃣ **119 신고** - 생명이 위험하다고 판단되면 즉시 119에 신고하세요
-2️⃣ **응급실 방문** - 가까운 응급실로 즉시 이동하세요  
-3️⃣ **안전한 자세** - 의식이 있다면 안전한 자세를 유지하세요
-
-📍 **24시간 응급실**:
-- 서울대병원 응급의료센터: 02-2072-2345
-- 삼성서울병원 응급실: 02-3410-2345  
-- 응급의료정보센터: 1339
-
-⚠️ 이 AI 상담은 응급치료를 대체할 수 없습니다. 즉시 전문 의료진의 도움을 받으세요!
-
-현재 증상: {message}
-감지된 응급 키워드: {', '.join(emergency_info['detected_keywords'])}"""
+        emergency_response = EMERGENCY_RESPONSE_TEMPLATE.format(
+            message=message,
+            keywords=", ".join(emergency_info["detected_keywords"])
+        )
 
         return {
             "session_id": self.session_id,
@@ -203,7 +305,7 @@ class MedicalAgent:
             "is_emergency": True,
             "urgency_level": "CRITICAL",
             "emergency_info": emergency_info,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "status": "emergency_detected"
         }
 
@@ -237,31 +339,39 @@ AI 응답: {ai_response}
             )
             
             # JSON 파싱 (마크다운 블록 제거)
-            clean_response = extraction_response.strip()
-            if clean_response.startswith("```json"):
-                clean_response = clean_response[7:]
-            if clean_response.endswith("```"):
-                clean_response = clean_response[:-3]
-            clean_response = clean_response.strip()
-            
-            extracted_info = json.loads(clean_response)
-            
-            # 환자 컨텍스트 업데이트 (기존 정보 유지하면서 새 정보 추가)
-            for key, value in extracted_info.items():
-                if value and value != "null":
-                    if key in ["symptoms", "allergies", "medications", "medical_history"]:
-                        # 리스트 타입은 기존 항목과 합치기
-                        existing = self.patient_context.get(key, [])
-                        if isinstance(value, list):
-                            self.patient_context[key] = list(set(existing + value))
-                    else:
-                        # 단일 값은 덮어쓰기
-                        self.patient_context[key] = value
-            
-            logger.info(f"Updated patient context: {self.patient_context}")
+            clean_response = json_utils.strip_code_fences(extraction_response)
+            extracted_info = json_utils.loads(clean_response)
+            self._update_patient_context(extracted_info)
                         
         except Exception as e:
-            logger.warning(f"Failed to extract medical info: {e}")
+            logger.warning("Failed to extract medical info: %s", e)
+
+    def _update_patient_context(self, extracted_info: Dict[str, Any]) -> None:
+        """환자 컨텍스트 업데이트 (기존 정보 유지하면서 새 정보 추가)"""
+        changed = False
+        for key, value in extracted_info.items():
+            if value and value != "null":
+                if key in self._patient_sets:
+                    # 누적 항목은 기존 set에 추가
+                    if isinstance(value, list):
+                        values = self._patient_sets[key]
+                        before = len(values)
+                        try:
+                            values.update(value)
+                        except TypeError:
+                            logger.warning("Ignoring non-hashable %s entries: %s", key, value)
+                        changed = changed or len(values) != before
+                elif self._patient_fields.get(key) != value:
+                    # 단일 값은 덮어쓰기
+                    self._patient_fields[key] = value
+                    changed = True
+
+        if changed:
+            self._patient_context = None
+            self._patient_context_str = None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Updated patient context: %s", self.patient_context)
 
     def _extract_department_recommendation(self, response: str) -> Optional[str]:
         """응답에서 추천 진료과 추출"""
@@ -272,17 +382,8 @@ AI 응답: {ai_response}
 
     def _assess_urgency(self, message: str) -> str:
         """메시지 기반 응급도 평가"""
-        high_urgency = ["심한", "급성", "갑자기", "응급", "위험", "심각"]
-        medium_urgency = ["아파", "불편", "걱정", "며칠째"]
-        
-        message_lower = message.lower()
-        
-        if any(keyword in message_lower for keyword in high_urgency):
-            return "high"
-        elif any(keyword in message_lower for keyword in medium_urgency):
-            return "medium"
-        else:
-            return "low"
+        _, urgency = _scan_message(message)
+        return urgency
 
     def get_available_appointments(self, department: str, date_preference: str = None) -> Dict[str, Any]:
         """예약 가능한 시간 조회"""
@@ -327,13 +428,17 @@ AI 응답: {ai_response}
                 "notes": "예약이 완료되었습니다. 예약 시간 10분 전까지 도착해 주세요."
             }
             
-            logger.info(f"Appointment booked: {booking_result}")
+            logger.info("Appointment booked: %s", booking_result)
             return booking_result
             
         except Exception as e:
             return {"error": f"예약 중 오류가 발생했습니다: {str(e)}"}
 
 
+# 웜 컨테이너에서 session_id별로 재사용하는 에이전트
+_agent_pool = AgentPool(lambda session_id: MedicalAgent(session_id=session_id))
+
+
 def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
     """Medical Agent Lambda/AgentCore handler"""
     try:
@@ -341,7 +446,8 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
         session_id = event.get('session_id')
         action = event.get('action', 'consult')
         
-        agent = MedicalAgent(session_id=session_id)
+        # 같은 세션이면 대화 히스토리와 환자 컨텍스트를 유지한 에이전트 재사용
+        agent = _agent_pool.get(session_id)
         
         if action == 'consult':
             result = agent.process_message(message, context=event.get('context'))
@@ -358,17 +464,17 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'body': json.dumps(result, ensure_ascii=False, default=str)
+            'body': json_utils.dumps(result, default=str)
         }
         
     except Exception as e:
-        logger.error(f"Handler error: {str(e)}", exc_info=True)
+        logger.error("Handler error: %s", e, exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_utils.dumps({
                 'error': str(e),
                 'type': type(e).__name__
-            }, ensure_ascii=False)
+            })
         }
 
 
@@ -7,22 +7,184 @@ This implements intelligent memory functionality using LLM providers:
 - Smart context retrieval and preference inference
 """
 
+import asyncio
 import json
 import logging
 import os
+import re
 import sys
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from collections import defaultdict
+import threading
+import time
+import warnings
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, AsyncContextManager, ClassVar, Deque, Dict, Hashable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from collections import OrderedDict, defaultdict, deque
 
 # Ensure project root is on sys.path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from tools.llm_provider import get_llm_provider
+from tools import json_utils
+from tools.keyword_matcher import KeywordMatcher
+from tools.llm_provider import LLMProvider, get_llm_provider
+from tools.logging_setup import configure_logging
+from tools.preference_store import PreferenceStore
+from tools.time_utils import iso_from_ns, now_iso
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class CacheInfo(NamedTuple):
+    """Hit/miss statistics in the shape of functools.lru_cache's cache_info()"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ExtractionCache:
+    """
+    Bounded LRU cache for parsed LLM extraction results
+
+    Keys are derived from the conversation text sent to the LLM, so repeated
+    turns skip both the network round-trip and JSON parsing. The least
+    recently used entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+
+# Fallback extraction triggers scanned in one pass: the name marker, then branch
+# phrases ("강남점") ahead of bare branch names so the more specific match wins
+_NAME_TRIGGER = "이름은"
+# Canonical (interned) branch names; LLM answers are mapped onto these objects
+_BRANCHES = {sys.intern(branch): sys.intern(branch) for branch in ("강남", "부산", "서울", "대전")}
+_BRANCH_PHRASES = {
+    **{f"{branch}점": branch for branch in _BRANCHES},
+    **_BRANCHES,
+}
+_FALLBACK_MATCHER = KeywordMatcher((_NAME_TRIGGER, *_BRANCH_PHRASES))
+# Rule-based topic keywords (user text) -> topic label, matched in one scan
+_TOPIC_KEYWORDS = {
+    "이름": "user_identity",
+    "예약": "appointment",
+    "지점": "location_preference",
+    "강남": "location_preference",
+    "부산": "location_preference",
+}
+_TOPIC_MATCHER = KeywordMatcher(_TOPIC_KEYWORDS)
+# Name after the marker, without the sentence ending ("성민이야." -> "성민")
+_NAME_RE = re.compile(r"이름은\s*([^\s.,!?]+?)(?:이야|야|입니다|이에요|에요|예요|이고|(?=[\s.,!?])|$)")
+
+# LLM extraction prompts, split around their dynamic parts so the static text
+# is built once at import instead of on every call
+_TOPIC_PROMPT_HEAD = """다음 대화에서 주요 토픽을 추출해 주세요. 각 토픽을 영어 키워드로 반환하세요.
+
+대화:
+"""
+_TOPIC_CATEGORIES = """토픽 카테고리:
+- user_identity: 사용자 신원/이름 관련
+- appointment: 예약/일정 관련  
+- location_preference: 지점/위치 선호도
+- service_inquiry: 서비스 문의
+- complaint: 불만/문제
+- compliment: 칭찬/만족
+- general: 일반 대화"""
+_TOPIC_PROMPT_TAIL = (
+    "\n\n" + _TOPIC_CATEGORIES + "\n\n"
+    '주요 토픽 3개를 JSON 배열로 반환하세요 (예: ["user_identity", "appointment", "location_preference"])'
+)
+
+# Per-turn extraction: preferences of the latest turn and topics of the
+# conversation in a single call
+_EXTRACTION_PROMPT_HEAD = """다음 대화에서 사용자의 개인정보와 선호도, 그리고 대화의 주요 토픽을 추출해 주세요.
+
+대화:
+"""
+_EXTRACTION_PROMPT_TAIL = """
+선호도 (preferences) - 마지막 사용자 입력에서 추출:
+1. 이름 (name): 사용자가 언급한 자신의 이름
+2. 선호 지점 (preferred_branch): 강남/부산/서울/대전 중 선호하는 지점
+3. 서비스 선호도 (service_preference): 선호하는 서비스나 요구사항
+4. 기타 개인정보 (other): 나이, 직업 등 기타 정보
+
+주요 토픽 (topics) - 대화 전체에서 최대 3개, 영어 키워드로:
+""" + _TOPIC_CATEGORIES + """
+
+결과를 JSON으로 반환하세요. 정보가 없으면 null을 사용하세요.
+예: {"preferences": {"name": "김민수", "preferred_branch": "강남", "service_preference": null, "other": null}, "topics": ["user_identity", "location_preference"]}"""
+# Batched extraction covers several turns, so preferences come from every user input
+_BATCH_EXTRACTION_PROMPT_TAIL = _EXTRACTION_PROMPT_TAIL.replace(
+    "마지막 사용자 입력에서 추출", "대화의 모든 사용자 입력에서 추출, 같은 항목은 나중 값 우선"
+)
+
+def _extraction_cache_key(conversation_text: str, batched: bool = False) -> bytes:
+    """Digest of the conversation sent for extraction, used as the cache key"""
+    # Batched prompts ask a different question about the same text; keep their keys apart
+    return blake2b(conversation_text.encode(), digest_size=16, person=b"batch" if batched else b"").digest()
+
+
+@dataclass(slots=True)
+class Turn:
+    """
+    One conversation turn
+
+    Slotted record instead of a 4-key dict. Item access (turn["user"],
+    "timestamp" in turn) is kept for code reading conversation_history;
+    get_recent_context() hands callers plain dicts via to_dict().
+    """
+    timestamp: str
+    user: str
+    agent: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    _FIELDS: ClassVar[frozenset] = frozenset(("timestamp", "user", "agent", "metadata"))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in Turn._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in Turn._FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"timestamp": self.timestamp, "user": self.user, "agent": self.agent, "metadata": self.metadata}
+
+
 class ShortTermMemory:
     """
     Short-term memory for single session context
@@ -30,38 +192,68 @@ class ShortTermMemory:
     Maintains conversation history within a session
     """
 
-    def __init__(self, session_id: str, max_turns: int = 50):
+    __slots__ = (
+        "session_id", "max_turns", "_llm_provider", "topic_cache", "conversation_history", "context",
+        "pending_tasks", "pending_extraction", "_cached_topics", "_topics_dirty", "turn_serial",
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        max_turns: int = 50,
+        llm_provider: Optional[LLMProvider] = None,
+        topic_cache: Optional[ExtractionCache] = None
+    ):
         self.session_id = session_id
         self.max_turns = max_turns
-        self.conversation_history: List[Dict[str, Any]] = []
+        self._llm_provider = llm_provider
+        # Parsed topic lists keyed by a digest of the analysed turns; MemoryManager
+        # shares one per manager (and so per provider) across its sessions
+        self.topic_cache = topic_cache
+        # Bounded FIFO: the oldest turn is dropped once max_turns is reached
+        self.conversation_history: Deque[Turn] = deque(maxlen=max_turns)
         self.context: Dict[str, Any] = {}
-        logger.info(f"ShortTermMemory initialized for session {session_id}")
+        # Preference extraction tasks scheduled by MemoryManager.aprocess_turn
+        self.pending_tasks: List[asyncio.Task] = []
+        # User inputs waiting for a batched extraction call (MemoryManager extraction_batch_size)
+        self.pending_extraction: List[str] = []
+        # Topics of the last summary; recomputed only after a new turn
+        self._cached_topics: Tuple[str, ...] = ()
+        self._topics_dirty = True
+        # Number of turns ever added; tells whether an extraction result is still current
+        self.turn_serial = 0
+        logger.info("ShortTermMemory initialized for session %s", session_id)
+
+    @property
+    def llm_provider(self) -> LLMProvider:
+        """LLM provider for topic extraction, resolved on first use"""
+        if self._llm_provider is None:
+            self._llm_provider = get_llm_provider()
+        return self._llm_provider
 
     def add_turn(self, user_input: str, agent_response: str, metadata: Dict[str, Any] = None) -> None:
         """Add a conversation turn to memory"""
-        turn = {
-            "timestamp": datetime.now().isoformat(),
-            "user": user_input,
-            "agent": agent_response,
-            "metadata": metadata or {}
-        }
+        turn = Turn(now_iso(), user_input, agent_response, metadata or {})
 
         self.conversation_history.append(turn)
+        self._topics_dirty = True
+        self.turn_serial += 1
 
-        # Keep only recent turns
-        if len(self.conversation_history) > self.max_turns:
-            self.conversation_history = self.conversation_history[-self.max_turns:]
+        logger.info("Added turn to memory. Total turns: %d", len(self.conversation_history))
 
-        logger.info(f"Added turn to memory. Total turns: {len(self.conversation_history)}")
+    def iter_recent(self, num_turns: int = 5) -> Iterator[Turn]:
+        """Iterate over the most recent turns without copying the history"""
+        history = self.conversation_history
+        return islice(history, max(0, len(history) - num_turns), None)
 
     def get_recent_context(self, num_turns: int = 5) -> List[Dict[str, Any]]:
         """Get recent conversation turns"""
-        return self.conversation_history[-num_turns:]
+        return [turn.to_dict() for turn in self.iter_recent(num_turns)]
 
     def extract_information(self, key: str, value: Any) -> None:
         """Extract and store contextual information"""
         self.context[key] = value
-        logger.info(f"Extracted context: {key} = {value}")
+        logger.info("Extracted context: %s = %s", key, value)
 
     def get_context(self, key: str) -> Optional[Any]:
         """Retrieve contextual information"""
@@ -73,137 +265,298 @@ class ShortTermMemory:
 
     def summarize(self) -> Dict[str, Any]:
         """Generate summary of conversation"""
+        return self._build_summary(self._extract_topics())
+
+    async def asummarize(self) -> Dict[str, Any]:
+        """Generate summary of conversation without blocking the event loop"""
+        return self._build_summary(await self._extract_topics_async())
+
+    def _build_summary(self, topics: List[str]) -> Dict[str, Any]:
         return {
             "session_id": self.session_id,
             "total_turns": len(self.conversation_history),
             "context": self.context,
-            "recent_topics": self._extract_topics()
+            "recent_topics": topics
         }
 
     def _extract_topics(self) -> List[str]:
         """Extract main topics from conversation using LLM analysis"""
         if not self.conversation_history:
             return []
+        if not self._topics_dirty:
+            return list(self._cached_topics)
+
+        conversation_text = self.format_recent(5)
+        cache_key = _extraction_cache_key(conversation_text)
+        cached = self.topic_cache.get(cache_key) if self.topic_cache is not None else None
+        if cached is not None:
+            return self._remember_topics(cached)
 
         try:
-            # Get LLM provider for topic extraction
-            llm_provider = get_llm_provider()
-            
-            # Prepare conversation text for analysis
-            conversation_text = ""
-            for turn in self.conversation_history[-5:]:  # Analyze last 5 turns
-                conversation_text += f"사용자: {turn['user']}\n"
-                conversation_text += f"어시스턴트: {turn['agent']}\n"
-
-            # LLM prompt for topic extraction
-            prompt = f"""다음 대화에서 주요 토픽을 추출해 주세요. 각 토픽을 영어 키워드로 반환하세요.
+            prompt = self._build_topic_prompt(conversation_text)
+            response = self.llm_provider.generate(prompt, temperature=0.1, max_tokens=100)
+            topics = self._parse_topics(response)
+            if topics is not None:
+                if self.topic_cache is not None:
+                    self.topic_cache.put(cache_key, tuple(topics))
+                return self._remember_topics(topics)
+        except Exception as e:
+            logger.error("LLM topic extraction failed: %s", e)
 
-대화:
-{conversation_text}
+        return self._remember_topics(self._fallback_topics())
 
-토픽 카테고리:
-- user_identity: 사용자 신원/이름 관련
-- appointment: 예약/일정 관련  
-- location_preference: 지점/위치 선호도
-- service_inquiry: 서비스 문의
-- complaint: 불만/문제
-- compliment: 칭찬/만족
-- general: 일반 대화
-
-주요 토픽 3개를 JSON 배열로 반환하세요 (예: ["user_identity", "appointment", "location_preference"])"""
-
-            response = llm_provider.generate(prompt, temperature=0.1, max_tokens=100)
-            
-            # Parse LLM response (handle markdown code blocks)  
-            try:
-                # Clean response - remove markdown code blocks if present
-                clean_response = response.strip()
-                if clean_response.startswith("```json"):
-                    clean_response = clean_response[7:]
-                if clean_response.endswith("```"):
-                    clean_response = clean_response[:-3]
-                clean_response = clean_response.strip()
-                
-                topics = json.loads(clean_response)
-                if isinstance(topics, list):
-                    return topics[:3]  # Limit to 3 topics
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM topic response: {response}")
-                pass
+    async def _extract_topics_async(self) -> List[str]:
+        """Async variant of _extract_topics using the provider's agenerate"""
+        if not self.conversation_history:
+            return []
+        if not self._topics_dirty:
+            return list(self._cached_topics)
+
+        conversation_text = self.format_recent(5)
+        cache_key = _extraction_cache_key(conversation_text)
+        cached = self.topic_cache.get(cache_key) if self.topic_cache is not None else None
+        if cached is not None:
+            return self._remember_topics(cached)
 
+        try:
+            prompt = self._build_topic_prompt(conversation_text)
+            response = await self.llm_provider.agenerate(prompt, temperature=0.1, max_tokens=100)
+            topics = self._parse_topics(response)
+            if topics is not None:
+                if self.topic_cache is not None:
+                    self.topic_cache.put(cache_key, tuple(topics))
+                return self._remember_topics(topics)
         except Exception as e:
-            logger.error(f"LLM topic extraction failed: {e}")
-
-        # Fallback to rule-based extraction
-        topics = set()
-        for turn in self.conversation_history:
-            if "이름" in turn["user"]:
-                topics.add("user_identity")
-            if "예약" in turn["user"]:
-                topics.add("appointment")
-            if "지점" in turn["user"] or "강남" in turn["user"] or "부산" in turn["user"]:
-                topics.add("location_preference")
+            logger.error("LLM topic extraction failed: %s", e)
+
+        return self._remember_topics(self._fallback_topics())
+
+    def set_topics(self, topics: Sequence[str], turn_serial: int) -> None:
+        """Store topics extracted elsewhere, if no turn was added since turn_serial"""
+        if turn_serial == self.turn_serial:
+            self._remember_topics(topics)
 
+    def _remember_topics(self, topics: Sequence[str]) -> List[str]:
+        """Keep topics until the next turn marks them stale"""
+        self._cached_topics = tuple(topics)
+        self._topics_dirty = False
         return list(topics)
 
+    @staticmethod
+    def _build_topic_prompt(conversation_text: str) -> str:
+        """Build the topic extraction prompt from the formatted last 5 turns"""
+        # Static prompt parts are module constants; only the turns are formatted
+        return "".join((_TOPIC_PROMPT_HEAD, conversation_text, _TOPIC_PROMPT_TAIL))
+
+    def format_recent(self, num_turns: int = 5) -> str:
+        """Recent turns as "사용자:/어시스턴트:" lines for LLM prompts"""
+        return "".join(
+            f"사용자: {turn.user}\n어시스턴트: {turn.agent}\n" for turn in self.iter_recent(num_turns)
+        )
+
+    def _parse_topics(self, response: str) -> Optional[List[str]]:
+        """Parse the LLM topic response, or None if it is unusable"""
+        # Parse LLM response (handle markdown code blocks)
+        try:
+            topics = json_utils.loads(json_utils.strip_code_fences(response))
+            if isinstance(topics, list):
+                return topics[:3]  # Limit to 3 topics
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse LLM topic response: %s", response)
+        return None
+
+    def _fallback_topics(self) -> List[str]:
+        """Rule-based topic extraction"""
+        # One pass over all user turns; newlines keep keywords from spanning turns
+        text = "\n".join(turn.user for turn in self.conversation_history)
+        return list(dict.fromkeys(_TOPIC_KEYWORDS[keyword] for keyword in _TOPIC_MATCHER.find(text)))
+
 
 class LongTermMemory:
     """
     Long-term memory for user profiles and preferences
 
-    Persists across sessions for the same user
+    Persists across sessions for the same user. With a PreferenceStore,
+    preference writes are buffered and written in batches by flush()
+    (write-behind). Reads are served from memory, except the first access
+    to a user, which loads that user's stored preferences synchronously.
     """
 
-    def __init__(self):
-        # In real implementation, this would be backed by DynamoDB or similar
-        self.user_profiles: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.user_sessions: Dict[str, List[str]] = defaultdict(list)
+    __slots__ = (
+        "_pref_values", "_pref_updated", "_created_at", "user_sessions", "store",
+        "_pending_writes", "_pending_lock", "_loaded_users", "max_pending_writes", "_flush_failures",
+    )
+
+    def __init__(self, store: Optional[PreferenceStore] = None, max_pending_writes: int = 10000):
+        # Preferences are kept as parallel per-user dicts (value / updated_at)
+        # so the hot read path is two plain lookups
+        self._pref_values: Dict[str, Dict[str, Any]] = {}
+        self._pref_updated: Dict[str, Dict[str, str]] = {}
+        self._created_at: Dict[str, str] = {}
+        # user_id -> [(session_id, recorded_at_ns, summary)]; dicts are built on read
+        self.user_sessions: Dict[str, List[Tuple[str, int, Dict[str, Any]]]] = defaultdict(list)
+        self.store = store
+        # (user_id, key) -> (value, updated_at) not yet written; repeated saves of a key coalesce
+        self._pending_writes: Dict[Tuple[str, str], Tuple[Any, str]] = {}
+        self._pending_lock = threading.Lock()
+        # Bound on buffered writes kept for retry while the store keeps failing
+        self.max_pending_writes = max_pending_writes
+        # Consecutive failed flushes; flush_periodically backs off on them
+        self._flush_failures = 0
+        # Users whose stored preferences were loaded successfully (or found empty)
+        self._loaded_users: set = set()
         logger.info("LongTermMemory initialized")
 
+    @property
+    def user_profiles(self) -> Mapping[str, Dict[str, Any]]:
+        """
+        Deprecated: read-only snapshot of all profiles in the legacy shape
+
+        Profiles are no longer stored as {"created_at", "preferences"} dicts,
+        so writes into this view could not take effect; use get_user_profile()
+        and save_user_preference() instead.
+        """
+        warnings.warn(
+            "LongTermMemory.user_profiles is deprecated and read-only; "
+            "use get_user_profile() and save_user_preference()",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return MappingProxyType({user_id: self._build_profile(user_id) for user_id in self._pref_values})
+
     def save_user_preference(self, user_id: str, key: str, value: Any) -> None:
         """Save user preference"""
-        if user_id not in self.user_profiles:
-            self.user_profiles[user_id] = {
-                "created_at": datetime.now().isoformat(),
-                "preferences": {}
-            }
+        timestamp = now_iso()
+        values = self._load_user(user_id)
+        if values is None:
+            values = self._pref_values[user_id] = {}
+            self._pref_updated[user_id] = {}
+            self._created_at[user_id] = timestamp
 
-        self.user_profiles[user_id]["preferences"][key] = {
-            "value": value,
-            "updated_at": datetime.now().isoformat()
-        }
+        values[key] = value
+        self._pref_updated[user_id][key] = timestamp
 
-        logger.info(f"Saved preference for user {user_id}: {key} = {value}")
+        if self.store is not None:
+            with self._pending_lock:
+                self._pending_writes[(user_id, key)] = (value, timestamp)
+
+        logger.info("Saved preference for user %s: %s = %s", user_id, key, value)
 
     def get_user_preference(self, user_id: str, key: str) -> Optional[Any]:
         """Get user preference"""
-        if user_id not in self.user_profiles:
-            return None
-
-        pref = self.user_profiles[user_id].get("preferences", {}).get(key)
-        return pref["value"] if pref else None
+        values = self._load_user(user_id)
+        return values.get(key) if values is not None else None
 
     def get_user_profile(self, user_id: str) -> Dict[str, Any]:
         """Get complete user profile"""
-        if user_id not in self.user_profiles:
+        if self._load_user(user_id) is None:
             return {}
+        return self._build_profile(user_id)
+
+    def _build_profile(self, user_id: str) -> Dict[str, Any]:
+        """Materialize the legacy profile dict for one user"""
+        updated = self._pref_updated[user_id]
+        return {
+            "created_at": self._created_at[user_id],
+            "preferences": {
+                key: {"value": value, "updated_at": updated[key]}
+                for key, value in self._pref_values[user_id].items()
+            }
+        }
+
+    def flush(self) -> int:
+        """
+        Write buffered preference updates to the store in one batch
 
-        return self.user_profiles[user_id].copy()
+        Returns the number of records written. On failure the records are
+        put back (unless a newer value was saved meanwhile) for the next flush;
+        beyond max_pending_writes the oldest buffered records are dropped.
+        """
+        if self.store is None:
+            return 0
+
+        with self._pending_lock:
+            pending, self._pending_writes = self._pending_writes, {}
+        if not pending:
+            return 0
+
+        try:
+            self.store.write_batch(
+                (user_id, key, value, updated_at)
+                for (user_id, key), (value, updated_at) in pending.items()
+            )
+        except Exception as e:
+            logger.error("Preference store flush failed: %s", e)
+            self._flush_failures += 1
+            with self._pending_lock:
+                # Failed records are older than anything saved meanwhile: keep them first
+                pending.update(self._pending_writes)
+                dropped = len(pending) - self.max_pending_writes
+                for item_key in list(islice(pending, max(0, dropped))):
+                    del pending[item_key]
+                self._pending_writes = pending
+            if dropped > 0:
+                logger.warning("Dropped %d buffered preference writes after repeated store failures", dropped)
+            return 0
+
+        self._flush_failures = 0
+        return len(pending)
+
+    async def flush_periodically(self, interval: float = 0.1) -> None:
+        """
+        Flush buffered writes every ``interval`` seconds until cancelled
+
+        After failed flushes the wait doubles per failure (up to 64x interval).
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval * 2 ** min(self._flush_failures, 6))
+                await asyncio.to_thread(self.flush)
+        finally:
+            await asyncio.to_thread(self.flush)
+
+    def _load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """In-memory preference values, loaded from the store on first access"""
+        values = self._pref_values.get(user_id)
+        if self.store is None or user_id in self._loaded_users:
+            return values
+
+        try:
+            stored = self.store.load_user(user_id)
+        except Exception as e:
+            # Not marked as loaded: the next access retries the store
+            logger.error("Preference store load failed for user %s: %s", user_id, e)
+            return values
+        self._loaded_users.add(user_id)
+        if not stored:
+            return values
+
+        if values is None:
+            values = self._pref_values[user_id] = {}
+            self._pref_updated[user_id] = {}
+        # Values saved while the store was unreachable are newer than the stored ones
+        updated = self._pref_updated[user_id]
+        for key, (value, updated_at) in stored.items():
+            if key not in values:
+                values[key] = value
+                updated[key] = updated_at
+        first_stored = min(updated_at for _, updated_at in stored.values())
+        self._created_at[user_id] = min(self._created_at.get(user_id, first_stored), first_stored)
+        return values
 
     def record_session(self, user_id: str, session_id: str, summary: Dict[str, Any]) -> None:
         """Record session summary for user"""
-        self.user_sessions[user_id].append({
-            "session_id": session_id,
-            "timestamp": datetime.now().isoformat(),
-            "summary": summary
-        })
+        self.user_sessions[user_id].append((session_id, time.time_ns(), summary))
 
-        logger.info(f"Recorded session {session_id} for user {user_id}")
+        logger.info("Recorded session %s for user %s", session_id, user_id)
 
     def get_user_sessions(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent sessions for user"""
         sessions = self.user_sessions.get(user_id, [])
-        return sessions[-limit:]
+        return [
+            {"session_id": session_id, "timestamp": iso_from_ns(recorded_at), "summary": summary}
+            for session_id, recorded_at, summary in sessions[-limit:]
+        ]
 
     def extract_preferences_from_session(self, user_id: str, session_summary: Dict[str, Any]) -> None:
         """
@@ -220,7 +573,7 @@ class LongTermMemory:
         if "user_name" in context:
             self.save_user_preference(user_id, "name", context["user_name"])
 
-        logger.info(f"Extracted preferences from session for user {user_id}")
+        logger.info("Extracted preferences from session for user %s", user_id)
 
 
 class MemoryManager:
@@ -228,15 +581,48 @@ class MemoryManager:
     Unified memory manager combining short-term and long-term memory
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm_provider: Optional[LLMProvider] = None,
+        preference_store: Optional[PreferenceStore] = None,
+        extraction_batch_size: int = 1,
+        max_concurrency: Optional[int] = 8
+    ):
         self.short_term_memories: Dict[str, ShortTermMemory] = {}
-        self.long_term_memory = LongTermMemory()
+        self._llm_provider = llm_provider
+        # Turns per preference extraction call; above 1, turns are buffered and
+        # extracted together (the rest of a batch is flushed at session end)
+        self.extraction_batch_size = extraction_batch_size
+        # Upper bound on concurrent async extraction calls (None: unbounded)
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Persistence is opt-in: pass a store, e.g. create_preference_store() for MEMORY_BACKEND
+        self.long_term_memory = LongTermMemory(preference_store)
+        # Parsed preference dicts keyed by a digest of (user_input, agent_response)
+        self.preference_cache = ExtractionCache(maxsize=4096)
+        # Parsed topic lists of this manager's sessions, keyed by a digest of their recent turns
+        self.topic_cache = ExtractionCache(maxsize=1024)
         logger.info("MemoryManager initialized")
 
+    @property
+    def llm_provider(self) -> LLMProvider:
+        """
+        LLM provider for extraction, resolved on first use
+
+        Resolved lazily (not in __init__) and then reused by this manager and
+        its session memories, so per-turn calls skip the provider lookup.
+        """
+        if self._llm_provider is None:
+            self._llm_provider = get_llm_provider()
+        return self._llm_provider
+
     def get_session_memory(self, session_id: str) -> ShortTermMemory:
         """Get or create short-term memory for session"""
         if session_id not in self.short_term_memories:
-            self.short_term_memories[session_id] = ShortTermMemory(session_id)
+            self.short_term_memories[session_id] = ShortTermMemory(
+                session_id, llm_provider=self.llm_provider, topic_cache=self.topic_cache
+            )
 
         return self.short_term_memories[session_id]
 
@@ -258,123 +644,244 @@ class MemoryManager:
         session_memory.add_turn(user_input, agent_response, metadata)
 
         # Extract any preferences for long-term storage
-        self._extract_and_store_preferences(session_id, user_id, user_input, agent_response)
+        if self.extraction_batch_size <= 1:
+            self._extract_and_store(session_id, user_id, (user_input,))
+            return
+
+        session_memory.pending_extraction.append(user_input)
+        if len(session_memory.pending_extraction) >= self.extraction_batch_size:
+            self._extract_and_store(session_id, user_id, self._take_pending_extraction(session_memory))
 
-    def _extract_and_store_preferences(
+    async def aprocess_turn(
         self,
         session_id: str,
         user_id: str,
         user_input: str,
-        agent_response: str
+        agent_response: str,
+        metadata: Dict[str, Any] = None
     ) -> None:
-        """Extract preferences from conversation using LLM analysis"""
+        """
+        Async variant of process_turn
+
+        The turn is stored immediately and preference extraction is scheduled
+        as a task, so several turns/sessions can wait on the LLM concurrently.
+        Pending tasks are awaited by aend_session (or flush_session).
+        """
+        session_memory = self.get_session_memory(session_id)
+        session_memory.add_turn(user_input, agent_response, metadata)
+
+        if self.extraction_batch_size <= 1:
+            self._schedule_extraction(session_memory, user_id, (user_input,))
+            return
+
+        session_memory.pending_extraction.append(user_input)
+        if len(session_memory.pending_extraction) >= self.extraction_batch_size:
+            self._schedule_extraction(session_memory, user_id, self._take_pending_extraction(session_memory))
+
+    def _schedule_extraction(self, session_memory: ShortTermMemory, user_id: str, user_inputs: Sequence[str]) -> None:
+        """Start an extraction task for the latest turns and track it on the session"""
+        # Snapshot the window now: later turns may be added before the task runs
+        conversation_text = session_memory.format_recent(max(5, len(user_inputs)))
+        task = asyncio.create_task(self._extract_and_store_async(
+            session_memory.session_id, user_id, user_inputs, conversation_text, session_memory.turn_serial
+        ))
+        session_memory.pending_tasks.append(task)
+
+    @staticmethod
+    def _take_pending_extraction(session_memory: ShortTermMemory) -> List[str]:
+        """Detach the user inputs buffered for the next batched extraction"""
+        pending, session_memory.pending_extraction = session_memory.pending_extraction, []
+        return pending
+
+    async def flush_session(self, session_id: str) -> None:
+        """Wait for all preference extraction tasks scheduled for a session"""
+        session_memory = self.short_term_memories.get(session_id)
+        if session_memory is None or not session_memory.pending_tasks:
+            return
+
+        pending, session_memory.pending_tasks = session_memory.pending_tasks, []
+        await asyncio.gather(*pending)
+
+    def _extract_and_store(self, session_id: str, user_id: str, user_inputs: Sequence[str]) -> None:
+        """
+        One extraction call covering the session's latest len(user_inputs) turns
+
+        The call returns preferences and conversation topics together, so
+        summarize() at session end can reuse the topics instead of issuing
+        its own request.
+        """
+        session_memory = self.get_session_memory(session_id)
+        turn_serial = session_memory.turn_serial
+        batched = len(user_inputs) > 1
+        conversation_text = session_memory.format_recent(max(5, len(user_inputs)))
+        cache_key = _extraction_cache_key(conversation_text, batched)
+        cached = self.preference_cache.get(cache_key)
+        if cached is not None:
+            self._apply_extraction(session_id, user_id, cached, turn_serial)
+            return
+
         try:
-            # Get LLM provider for preference extraction
-            llm_provider = get_llm_provider()
-            
-            # LLM prompt for preference extraction
-            prompt = f"""다음 대화에서 사용자의 개인정보와 선호도를 추출해 주세요.
+            prompt = self._build_extraction_prompt(conversation_text, batched)
+            response = self.llm_provider.generate(prompt, temperature=0.1, max_tokens=300)
+        except Exception as e:
+            logger.error("LLM preference extraction failed: %s", e)
+            # Fall back to rule-based extraction
+            self._fallback_preference_extraction_all(session_id, user_id, user_inputs)
+            return
 
-사용자 입력: {user_input}
-어시스턴트 응답: {agent_response}
+        self._store_extraction_response(session_id, user_id, user_inputs, response, cache_key, turn_serial)
 
-추출할 정보:
-1. 이름 (name): 사용자가 언급한 자신의 이름
-2. 선호 지점 (preferred_branch): 강남/부산/서울/대전 중 선호하는 지점
-3. 서비스 선호도 (service_preference): 선호하는 서비스나 요구사항
-4. 기타 개인정보 (other): 나이, 직업 등 기타 정보
+    async def _extract_and_store_async(
+        self,
+        session_id: str,
+        user_id: str,
+        user_inputs: Sequence[str],
+        conversation_text: str,
+        turn_serial: int
+    ) -> None:
+        """
+        Async variant of _extract_and_store using agenerate
 
-결과를 JSON으로 반환하세요. 정보가 없으면 null을 사용하세요.
-예: {{"name": "김민수", "preferred_branch": "강남", "service_preference": null, "other": null}}"""
+        conversation_text and turn_serial are captured when the extraction is
+        scheduled, so each task analyses the turns it was created for.
+        """
+        batched = len(user_inputs) > 1
+        cache_key = _extraction_cache_key(conversation_text, batched)
+        cached = self.preference_cache.get(cache_key)
+        if cached is not None:
+            self._apply_extraction(session_id, user_id, cached, turn_serial)
+            return
 
-            response = llm_provider.generate(prompt, temperature=0.1, max_tokens=200)
-            
+        try:
+            prompt = self._build_extraction_prompt(conversation_text, batched)
+            async with self._extraction_slot():
+                response = await self.llm_provider.agenerate(prompt, temperature=0.1, max_tokens=300)
+        except Exception as e:
+            logger.error("LLM preference extraction failed: %s", e)
+            self._fallback_preference_extraction_all(session_id, user_id, user_inputs)
+            return
+
+        self._store_extraction_response(session_id, user_id, user_inputs, response, cache_key, turn_serial)
+
+    def _extraction_slot(self) -> AsyncContextManager[Any]:
+        """Semaphore limiting in-flight async extraction calls to max_concurrency"""
+        if not self.max_concurrency:
+            return nullcontext()
+
+        # Semaphores bind to the event loop they first wait on; make one per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _build_extraction_prompt(conversation_text: str, batched: bool = False) -> str:
+        """LLM prompt for combined preference and topic extraction"""
+        tail = _BATCH_EXTRACTION_PROMPT_TAIL if batched else _EXTRACTION_PROMPT_TAIL
+        return "".join((_EXTRACTION_PROMPT_HEAD, conversation_text, tail))
+
+    def _store_extraction_response(
+        self,
+        session_id: str,
+        user_id: str,
+        user_inputs: Sequence[str],
+        response: str,
+        cache_key: bytes,
+        turn_serial: int
+    ) -> None:
+        """Parse the LLM extraction response, cache it and store the extracted values"""
+        try:
             # Parse LLM response (handle markdown code blocks)
-            try:
-                # Clean response - remove markdown code blocks if present
-                clean_response = response.strip()
-                if clean_response.startswith("```json"):
-                    clean_response = clean_response[7:]
-                if clean_response.endswith("```"):
-                    clean_response = clean_response[:-3]
-                clean_response = clean_response.strip()
-                
-                preferences = json.loads(clean_response)
-                
-                session_memory = self.get_session_memory(session_id)
-                
-                # Store extracted preferences
-                if preferences.get("name"):
-                    session_memory.extract_information("user_name", preferences["name"])
-                    self.long_term_memory.save_user_preference(user_id, "name", preferences["name"])
-                    logger.info(f"Extracted user name: {preferences['name']}")
-                
-                if preferences.get("preferred_branch"):
-                    # Normalize branch names
-                    branch_map = {"강남": "강남", "부산": "부산", "서울": "서울", "대전": "대전"}
-                    normalized_branch = branch_map.get(preferences["preferred_branch"])
-                    if normalized_branch:
-                        session_memory.extract_information("preferred_branch", normalized_branch)
-                        self.long_term_memory.save_user_preference(user_id, "preferred_branch", normalized_branch)
-                        logger.info(f"Extracted preferred branch: {normalized_branch}")
-                
-                if preferences.get("service_preference"):
-                    session_memory.extract_information("service_preference", preferences["service_preference"])
-                    self.long_term_memory.save_user_preference(user_id, "service_preference", preferences["service_preference"])
-                
-                if preferences.get("other"):
-                    session_memory.extract_information("other_info", preferences["other"])
-
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM preference response: {response}")
-                # Fall back to rule-based extraction
-                self._fallback_preference_extraction(session_id, user_id, user_input)
+            result = json_utils.loads(json_utils.strip_code_fences(response))
+            self._apply_extraction(session_id, user_id, result, turn_serial)
+            self.preference_cache.put(cache_key, result)
 
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse LLM preference response: %s", response)
+            # Fall back to rule-based extraction
+            self._fallback_preference_extraction_all(session_id, user_id, user_inputs)
         except Exception as e:
-            logger.error(f"LLM preference extraction failed: {e}")
+            logger.error("LLM preference extraction failed: %s", e)
             # Fall back to rule-based extraction
-            self._fallback_preference_extraction(session_id, user_id, user_input)
+            self._fallback_preference_extraction_all(session_id, user_id, user_inputs)
+
+    def _apply_extraction(self, session_id: str, user_id: str, result: Dict[str, Any], turn_serial: int) -> None:
+        """Split a combined extraction result into preferences and session topics"""
+        preferences = result.get("preferences")
+        if not isinstance(preferences, dict):
+            # Flat {"name": ..., "preferred_branch": ...} answers carry no topics
+            self._apply_preferences(session_id, user_id, result)
+            return
+
+        self._apply_preferences(session_id, user_id, preferences)
+
+        topics = result.get("topics")
+        if isinstance(topics, list):
+            self.get_session_memory(session_id).set_topics(topics[:3], turn_serial)
+
+    def _apply_preferences(self, session_id: str, user_id: str, preferences: Dict[str, Any]) -> None:
+        """Store parsed preferences in session and long-term memory"""
+        session_memory = self.get_session_memory(session_id)
+
+        # Store extracted preferences
+        if preferences.get("name"):
+            session_memory.extract_information("user_name", preferences["name"])
+            self.long_term_memory.save_user_preference(user_id, "name", preferences["name"])
+            logger.info("Extracted user name: %s", preferences["name"])
+
+        if preferences.get("preferred_branch"):
+            # Normalize branch names
+            normalized_branch = _BRANCHES.get(preferences["preferred_branch"])
+            if normalized_branch:
+                session_memory.extract_information("preferred_branch", normalized_branch)
+                self.long_term_memory.save_user_preference(user_id, "preferred_branch", normalized_branch)
+                logger.info("Extracted preferred branch: %s", normalized_branch)
+
+        if preferences.get("service_preference"):
+            session_memory.extract_information("service_preference", preferences["service_preference"])
+            self.long_term_memory.save_user_preference(user_id, "service_preference", preferences["service_preference"])
+
+        if preferences.get("other"):
+            session_memory.extract_information("other_info", preferences["other"])
 
     def _fallback_preference_extraction(self, session_id: str, user_id: str, user_input: str) -> None:
         """Fallback rule-based preference extraction"""
-        # Extract name
-        if "내 이름은" in user_input or "이름은" in user_input:
-            parts = user_input.split("이름은")
-            if len(parts) > 1:
-                name = parts[1].strip().replace("이야", "").replace(".", "").strip()
-                if name:
-                    session_memory = self.get_session_memory(session_id)
-                    session_memory.extract_information("user_name", name)
-                    self.long_term_memory.save_user_preference(user_id, "name", name)
-
-        # Extract location preference
-        branch_candidates = [
-            ("강남점", "강남"), ("부산점", "부산"), ("서울점", "서울"), ("대전점", "대전"),
-        ]
-
-        matched_branch = None
-        for phrase, normalized in branch_candidates:
-            if phrase in user_input:
-                matched_branch = normalized
-                break
+        hits = _FALLBACK_MATCHER.find(user_input)
+        if not hits:
+            return
 
-        if not matched_branch:
-            for normalized in ["강남", "부산", "서울", "대전"]:
-                if normalized in user_input:
-                    matched_branch = normalized
-                    break
+        # Extract name ("내 이름은" also contains the "이름은" marker)
+        if hits[0] == _NAME_TRIGGER:
+            match = _NAME_RE.search(user_input)
+            if match:
+                name = match.group(1)
+                session_memory = self.get_session_memory(session_id)
+                session_memory.extract_information("user_name", name)
+                self.long_term_memory.save_user_preference(user_id, "name", name)
+            hits = hits[1:]
 
-        if matched_branch:
+        # Extract location preference (first hit in declaration order)
+        if hits:
+            matched_branch = _BRANCH_PHRASES[hits[0]]
             session_memory = self.get_session_memory(session_id)
             session_memory.extract_information("preferred_branch", matched_branch)
             self.long_term_memory.save_user_preference(user_id, "preferred_branch", matched_branch)
 
+    def _fallback_preference_extraction_all(self, session_id: str, user_id: str, user_inputs: Sequence[str]) -> None:
+        """Rule-based extraction over several user inputs, later inputs winning"""
+        for user_input in user_inputs:
+            self._fallback_preference_extraction(session_id, user_id, user_input)
+
     def end_session(self, session_id: str, user_id: str) -> None:
         """End session and transfer learnings to long-term memory"""
         if session_id not in self.short_term_memories:
             return
 
         session_memory = self.short_term_memories[session_id]
+        # Extract the rest of a partially filled batch
+        if session_memory.pending_extraction:
+            self._extract_and_store(session_id, user_id, self._take_pending_extraction(session_memory))
         summary = session_memory.summarize()
 
         # Record session in long-term memory
@@ -383,7 +890,28 @@ class MemoryManager:
         # Extract any additional preferences
         self.long_term_memory.extract_preferences_from_session(user_id, summary)
 
-        logger.info(f"Ended session {session_id} for user {user_id}")
+        # Persist the session's buffered preference writes in one batch
+        self.long_term_memory.flush()
+
+        logger.info("Ended session %s for user %s", session_id, user_id)
+
+    async def aend_session(self, session_id: str, user_id: str) -> None:
+        """Async variant of end_session; waits for pending extraction first"""
+        if session_id not in self.short_term_memories:
+            return
+
+        session_memory = self.short_term_memories[session_id]
+        if session_memory.pending_extraction:
+            self._schedule_extraction(session_memory, user_id, self._take_pending_extraction(session_memory))
+        await self.flush_session(session_id)
+
+        summary = await session_memory.asummarize()
+
+        self.long_term_memory.record_session(user_id, session_id, summary)
+        self.long_term_memory.extract_preferences_from_session(user_id, summary)
+        await asyncio.to_thread(self.long_term_memory.flush)
+
+        logger.info("Ended session %s for user %s", session_id, user_id)
 
     def get_user_context(self, user_id: str) -> Dict[str, Any]:
         """Get user's long-term context for new session"""
@@ -395,8 +923,18 @@ class MemoryManager:
             "recent_sessions": recent_sessions
         }
 
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """Hit/miss statistics of the LLM extraction caches"""
+        return {
+            "preferences": self.preference_cache.cache_info(),
+            "topics": self.topic_cache.cache_info()
+        }
+
 
 if __name__ == "__main__":
+    # Library module: logging is configured by the importing agent, or here when run directly
+    configure_logging()
+
     # Test memory manager
     manager = MemoryManager()
 
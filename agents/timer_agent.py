@@ -7,24 +7,39 @@ This agent tests:
 - Session state maintenance
 """
 
+import asyncio
 import json
 import logging
+import os
 import sys
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+
+# Ensure project root is on sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from tools import json_utils
+from tools.logging_setup import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('/tmp/timer_agent.log')
-    ]
-)
+# Records go through a QueueHandler so the loop never blocks on stdout/file I/O;
+# set LOCAL_LOG_FILE=1 to also write /tmp/timer_agent.log
+configure_logging('/tmp/timer_agent.log')
 logger = logging.getLogger(__name__)
 
+# Default checkpoint path; TIMER_CHECKPOINT overrides it (read when the file is opened)
+CHECKPOINT_FILE = "/tmp/timer_checkpoints.log"
+# Buffered checkpoint lines are flushed to the file every N iterations, once the
+# buffer reaches CHECKPOINT_BUFFER_BYTES, and at loop end
+CHECKPOINT_FLUSH_EVERY = 16
+CHECKPOINT_BUFFER_BYTES = 64 * 1024
+# Smoothing factor of the per-tick cost moving average
+TICK_COST_ALPHA = 0.1
+# Above this fraction of the interval the loop is treated as overloaded
+OVERLOAD_RATIO = 0.8
+
 
 class TimerAgent:
     """Agent for testing long-running sessions"""
@@ -32,72 +47,179 @@ class TimerAgent:
     def __init__(self, session_id: str = None):
         self.session_id = session_id or self._generate_session_id()
         self.start_time = datetime.now()
-        self.timestamps: List[str] = []
-        logger.info(f"TimerAgent initialized at {self.start_time.isoformat()}")
+        # Monotonic reference for elapsed time (immune to wall-clock adjustments)
+        self._start_mono = time.monotonic()
+        # POSIX timestamps (8 bytes each); ISO strings are built once in the result
+        self.timestamps = array('d')
+        # Checkpoint rows are buffered and appended with one os.write per flush;
+        # the fd is opened on the first flush and kept for the agent's lifetime
+        self._checkpoint_fd: Optional[int] = None
+        self._checkpoint_buffer = bytearray()
+        self._unflushed_checkpoints = 0
+        logger.info("TimerAgent initialized at %s", self.start_time.isoformat())
 
     def _generate_session_id(self) -> str:
         """Generate a unique session ID"""
         return f"timer_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-    def run_timed_loop(self, duration_minutes: int = 5, interval_minutes: int = 1) -> Dict[str, Any]:
+    def run_timed_loop(self, duration_minutes: int = 5, interval_minutes: int = 1,
+                       include_timestamps: bool = True) -> Dict[str, Any]:
         """
         Run a timed loop that logs timestamps at regular intervals
 
+        Blocking wrapper around arun_timed_loop for synchronous callers;
+        async code should await arun_timed_loop instead.
+
+        Args:
+            duration_minutes: Total duration to run (default 5 minutes)
+            interval_minutes: Interval between logs (default 1 minute)
+            include_timestamps: Include the ISO timestamp list in the result
+
+        Returns:
+            Dict containing execution results and timestamps
+        """
+        return _run_blocking(self.arun_timed_loop(duration_minutes, interval_minutes, include_timestamps))
+
+    async def arun_timed_loop(self, duration_minutes: int = 5, interval_minutes: int = 1,
+                              include_timestamps: bool = True) -> Dict[str, Any]:
+        """
+        Async timed loop; waits with asyncio.sleep so the event loop can serve
+        other sessions between iterations
+
         Args:
             duration_minutes: Total duration to run (default 5 minutes)
             interval_minutes: Interval between logs (default 1 minute)
+            include_timestamps: Include the ISO timestamp list in the result
+                (otherwise only timestamps_collected is reported)
 
         Returns:
             Dict containing execution results and timestamps
+
+        Raises:
+            ValueError: If interval_minutes is not positive
         """
-        logger.info(f"Starting timed loop: {duration_minutes}min total, {interval_minutes}min interval")
+        # The tick schedule divides by the interval (tick skipping, overload spacing)
+        if interval_minutes <= 0:
+            raise ValueError(f"interval_minutes must be positive, got {interval_minutes}")
+
+        logger.info("Starting timed loop: %smin total, %smin interval", duration_minutes, interval_minutes)
 
         duration_seconds = duration_minutes * 60
         interval_seconds = interval_minutes * 60
-        end_time = time.time() + duration_seconds
+        # Deadlines on the monotonic clock (unaffected by wall-clock changes)
+        start_mono = time.monotonic()
+        end_time = start_mono + duration_seconds
 
         iteration = 0
-        while time.time() < end_time:
-            iteration += 1
-            current_time = datetime.now().isoformat()
-            elapsed = (datetime.now() - self.start_time).total_seconds()
-
-            self.timestamps.append(current_time)
-            logger.info(f"[Iteration {iteration}] Timestamp: {current_time} | Elapsed: {elapsed:.1f}s")
+        tick = 0
+        skipped_ticks = 0
+        tick_cost_avg = None
+        overloaded = False
+        mono_now = start_mono
+        while mono_now < end_time:
+            tick_start = mono_now
+            # Iterations follow the tick schedule, so skipped ticks are counted too
+            iteration = tick + 1
+            # One wall-clock read per iteration; timestamp and elapsed derive from it
+            now_dt = datetime.now()
+            current_time = now_dt.isoformat()
+            elapsed = (now_dt - self.start_time).total_seconds()
+
+            self.timestamps.append(now_dt.timestamp())
+            logger.info("[Iteration %d] Timestamp: %s | Elapsed: %.1fs", iteration, current_time, elapsed)
 
             # Write to file for persistence testing
             self._write_checkpoint(iteration, current_time, elapsed)
 
-            # Sleep until next interval (or end)
-            remaining = end_time - time.time()
-            sleep_duration = min(interval_seconds, remaining)
+            mono_now = time.monotonic()
+            tick_cost = mono_now - tick_start
+            tick_cost_avg = tick_cost if tick_cost_avg is None else (
+                (1 - TICK_COST_ALPHA) * tick_cost_avg + TICK_COST_ALPHA * tick_cost
+            )
+
+            # Under sustained overload stretch the spacing to twice the average
+            # tick cost and coalesce the ticks in between into one skip
+            earliest = mono_now
+            if tick_cost_avg > interval_seconds * OVERLOAD_RATIO:
+                if not overloaded:
+                    logger.warning("Timer loop overloaded: avg tick cost %.2fs, interval %ss", tick_cost_avg, interval_seconds)
+                overloaded = True
+                earliest += max(interval_seconds, 2 * tick_cost_avg) - interval_seconds
+            else:
+                overloaded = False
+
+            # Sleep until the next absolute tick (start + n * interval) so the time
+            # spent logging/checkpointing does not push later ticks back.
+            # Ticks that already passed are skipped rather than run back-to-back.
+            next_tick = max(tick + 1, int((earliest - start_mono) // interval_seconds) + 1)
+            if next_tick > tick + 1:
+                skipped_ticks += next_tick - tick - 1
+                logger.warning("Skipped %d ticks after iteration %d", next_tick - tick - 1, iteration)
+            tick = next_tick
+            sleep_duration = min(start_mono + tick * interval_seconds, end_time) - mono_now
 
             if sleep_duration > 0:
-                logger.info(f"Sleeping for {sleep_duration:.1f}s...")
-                time.sleep(sleep_duration)
+                await asyncio.sleep(sleep_duration)
+            mono_now = time.monotonic()
 
-        total_elapsed = (datetime.now() - self.start_time).total_seconds()
-        logger.info(f"Timed loop completed. Total elapsed: {total_elapsed:.1f}s")
+        self.flush_checkpoints()
 
-        return {
+        end_dt = datetime.now()
+        total_elapsed = (end_dt - self.start_time).total_seconds()
+        logger.info("Timed loop completed. Total elapsed: %.1fs", total_elapsed)
+
+        result = {
             "session_id": self.session_id,
             "start_time": self.start_time.isoformat(),
-            "end_time": datetime.now().isoformat(),
+            "end_time": end_dt.isoformat(),
             "total_elapsed_seconds": total_elapsed,
             "iterations": iteration,
-            "timestamps": self.timestamps,
+            "skipped_ticks": skipped_ticks,
+            "timestamps_collected": len(self.timestamps),
             "status": "completed"
         }
+        if include_timestamps:
+            result["timestamps"] = [datetime.fromtimestamp(ts).isoformat() for ts in self.timestamps]
+        return result
 
     def _write_checkpoint(self, iteration: int, timestamp: str, elapsed: float) -> None:
-        """Write checkpoint data to file"""
-        checkpoint_file = "/tmp/timer_checkpoints.log"
-        with open(checkpoint_file, 'a') as f:
-            f.write(f"{iteration},{timestamp},{elapsed:.2f}\n")
+        """Write checkpoint data to file (buffered, see flush_checkpoints)"""
+        self._checkpoint_buffer += f"{iteration},{timestamp},{elapsed:.2f}\n".encode()
+        self._unflushed_checkpoints += 1
+        if (self._unflushed_checkpoints >= CHECKPOINT_FLUSH_EVERY
+                or len(self._checkpoint_buffer) >= CHECKPOINT_BUFFER_BYTES):
+            self.flush_checkpoints()
+
+    def flush_checkpoints(self) -> None:
+        """Append buffered checkpoint lines to the checkpoint file"""
+        if self._checkpoint_buffer:
+            if self._checkpoint_fd is None:
+                path = os.getenv("TIMER_CHECKPOINT", CHECKPOINT_FILE)
+                self._checkpoint_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+
+            with memoryview(self._checkpoint_buffer) as data:
+                written = 0
+                while written < len(data):
+                    written += os.write(self._checkpoint_fd, data[written:])
+            self._checkpoint_buffer.clear()
+        self._unflushed_checkpoints = 0
+
+    def close(self) -> None:
+        """Flush and close the checkpoint file"""
+        self.flush_checkpoints()
+        if self._checkpoint_fd is not None:
+            os.close(self._checkpoint_fd)
+            self._checkpoint_fd = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
-        elapsed = (datetime.now() - self.start_time).total_seconds()
+        elapsed = time.monotonic() - self._start_mono
         return {
             "session_id": self.session_id,
             "start_time": self.start_time.isoformat(),
@@ -108,10 +230,44 @@ class TimerAgent:
         }
 
 
+_T = TypeVar("_T")
+
+
+def _run_blocking(coro: Awaitable[_T]) -> _T:
+    """
+    Run a coroutine to completion from synchronous code
+
+    asyncio.run cannot be used while this thread already runs an event loop
+    (sync API called from async code); the coroutine then runs on its own
+    loop in a worker thread and the caller blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
     """
     Lambda/AgentCore Runtime handler function
 
+    Args:
+        event: Input event with configuration
+        context: Lambda context (optional)
+
+    Returns:
+        Response dict with execution results
+    """
+    return _run_blocking(async_handler(event, context))
+
+
+async def async_handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Async handler for runtimes that already run an event loop
+
     Args:
         event: Input event with configuration
         context: Lambda context (optional)
@@ -125,12 +281,14 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
         action = event.get('action', 'run')
         duration_minutes = event.get('duration_minutes', 5)
         interval_minutes = event.get('interval_minutes', 1)
+        # The per-tick timestamp list grows with session length; opt-in only
+        include_timestamps = bool(event.get('include_timestamps', False))
 
         # Initialize agent
         agent = TimerAgent(session_id=session_id)
 
         if action == 'run':
-            result = agent.run_timed_loop(duration_minutes, interval_minutes)
+            result = await agent.arun_timed_loop(duration_minutes, interval_minutes, include_timestamps)
         elif action == 'status':
             result = agent.get_status()
         else:
@@ -138,14 +296,14 @@ def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result)
+            'body': json_utils.dumps(result)
         }
 
     except Exception as e:
-        logger.error(f"Error in timer agent: {str(e)}", exc_info=True)
+        logger.error("Error in timer agent: %s", e, exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_utils.dumps({
                 'error': str(e),
                 'type': type(e).__name__
             })
@@ -159,7 +317,8 @@ if __name__ == "__main__":
     event = {
         "action": "run",
         "duration_minutes": 2,
-        "interval_minutes": 0.5  # 30 seconds
+        "interval_minutes": 0.5,  # 30 seconds
+        "include_timestamps": True
     }
 
     result = handler(event)
@@ -2,9 +2,15 @@
 Pytest configuration and fixtures for AWS AgentCore tests
 """
 
+import importlib.util
 import pytest
 import sys
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Calculator OpenAPI spec served by tools/calculator_service.py
+_SPEC_PATH = Path(__file__).resolve().parent / "tools" / "openapi" / "calculator_api.yaml"
 
 
 def pytest_configure(config):
@@ -12,6 +18,11 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "service_tests: tests that require external services running"
     )
+    if config.getoption("--cache-http") and importlib.util.find_spec("requests_cache") is None:
+        raise pytest.UsageError("--cache-http requires requests-cache. Install with: pip install requests-cache")
+    # Per-test teach hooks are only dispatched when teach mode is on
+    if _teach_enabled(config):
+        config.pluginmanager.register(TeachPlugin(), "teach")
 
 
 @pytest.fixture(scope="session")
@@ -26,31 +37,107 @@ def mock_session_id():
     return "test_session_123"
 
 
+@pytest.fixture(scope="function")
+def session_id(request):
+    """Session ID unique per test, so parallel runs never share session state"""
+    return f"{request.node.name}_{uuid.uuid4().hex}"
+
+
 @pytest.fixture(scope="function")
 def mock_user_id():
     """Generate mock user ID"""
     return "test_user_123"
 
 
+@pytest.fixture
+def session_file(tmp_path, monkeypatch):
+    """Per-test path for the echo agent's session file (SESSION_FILE)"""
+    path = tmp_path / "session.txt"
+    monkeypatch.setenv("SESSION_FILE", str(path))
+    return path
+
+
+@pytest.fixture(scope="session")
+def handler_body():
+    """Helper that checks a handler response's status code and returns its decoded JSON body"""
+    from tools import json_utils
+
+    def decode(response, expected_status=200):
+        assert response["statusCode"] == expected_status
+        return json_utils.loads(response["body"])
+
+    return decode
+
+
+@pytest.fixture(scope="module")
+def echo_agent():
+    """Shared LLMAgent for tests that only read its responses (one per module)"""
+    from agents.echo_agent import LLMAgent
+    return LLMAgent(session_id="fixture_session")
+
+
+@pytest.fixture(scope="module")
+def mock_llm_agent():
+    """Shared LLMAgent backed by MockProvider (one per module)"""
+    from agents.echo_agent import LLMAgent
+    from tools.llm_provider import MockProvider
+
+    agent = LLMAgent(session_id="fixture_mock_session")
+    agent.llm_provider = MockProvider()
+    return agent
+
+
+@pytest.fixture(scope="session")
+def openapi_spec():
+    """Calculator OpenAPI specification, parsed and validated once per test run"""
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(_SPEC_PATH, 'r') as f:
+        spec = yaml.load(f, Loader=loader)
+
+    # Full OpenAPI 3.0 schema check when openapi-spec-validator is installed;
+    # an invalid spec fails every test that uses this fixture
+    try:
+        from openapi_spec_validator import validate
+    except ImportError:
+        pass
+    else:
+        validate(spec)
+    return spec
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_cache(request):
+    """Opt-in (--cache-http) SQLite response cache for requests during local iteration"""
+    if not request.config.getoption("--cache-http"):
+        yield None
+        return
+
+    import requests_cache
+
+    # The calculator API is deterministic, so its POSTs are safe to cache too
+    requests_cache.install_cache(
+        cache_name=str(Path(__file__).resolve().parent / ".cache" / "gateway-tests"),
+        expire_after=timedelta(hours=1),
+        allowable_methods=("GET", "HEAD", "POST"),
+    )
+    try:
+        yield requests_cache.get_cache()
+    finally:
+        requests_cache.uninstall_cache()
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection"""
-    # Auto-mark slow tests
+    # Auto-mark slow tests (timer loop tests run on a virtual clock, so only
+    # full-duration scenarios are treated as slow)
     for item in items:
-        if "long_running" in item.nodeid or "full_duration" in item.nodeid:
+        if "full_duration" in item.nodeid:
             item.add_marker(pytest.mark.slow)
 
 
-def pytest_sessionstart(session):
-    """Compatibility shim for older test code expecting pytest.config.
-
-    pytest 7+ deprecated and pytest 9 removed the global `pytest.config`.
-    Some tests in this repo reference `pytest.config.getoption(...)`.
-    This hook reintroduces a compatible attribute pointing to session.config.
-    """
-    if not hasattr(pytest, "config"):
-        pytest.config = session.config
-
-
 def pytest_addoption(parser):
     """Global CLI options for learning/teaching mode"""
     parser.addoption(
@@ -59,6 +146,18 @@ def pytest_addoption(parser):
         default=False,
         help="Show step-by-step learning logs (fixtures, docstrings, outcomes)",
     )
+    parser.addoption(
+        "--run-service-tests",
+        action="store_true",
+        default=False,
+        help="Run tests that require calculator service to be running",
+    )
+    parser.addoption(
+        "--cache-http",
+        action="store_true",
+        default=False,
+        help="Replay identical HTTP requests from a local requests-cache (service tests)",
+    )
 
 
 def _teach_enabled(config) -> bool:
@@ -68,9 +167,11 @@ def _teach_enabled(config) -> bool:
         return False
 
 
-def pytest_runtest_setup(item):
-    """Print setup context when teach mode is enabled"""
-    if _teach_enabled(item.config):
+class TeachPlugin:
+    """Step-by-step learning logs; registered only when --teach is passed"""
+
+    def pytest_runtest_setup(self, item):
+        """Print setup context"""
         doc = getattr(getattr(item, "function", None), "__doc__", None)
         doc_line = (doc or "").strip().splitlines()[0] if doc else ""
         fixtures = ", ".join(item.fixturenames) if getattr(item, "fixturenames", None) else "-"
@@ -79,20 +180,16 @@ def pytest_runtest_setup(item):
             print(f"[TEACH]    Doc: {doc_line}")
         print(f"[TEACH]    Fixtures: {fixtures}")
 
-
-def pytest_runtest_call(item):
-    """Indicate test call start in teach mode"""
-    if _teach_enabled(item.config):
+    def pytest_runtest_call(self, item):
+        """Indicate test call start"""
         print(f"[TEACH] ▶ Call:   {item.name} at {datetime.now().isoformat(timespec='seconds')}")
 
-
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """Report test outcome in teach mode"""
-    outcome = yield
-    rep = outcome.get_result()
-    if _teach_enabled(item.config) and rep.when == "call":
-        status = "PASSED" if rep.passed else ("SKIPPED" if rep.skipped else "FAILED")
-        dur_ms = int(rep.duration * 1000)
-        print(f"[TEACH] ▶ Result: {status} ({dur_ms} ms) :: {item.nodeid}")
-    return rep
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Report test outcome"""
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.when == "call":
+            status = "PASSED" if rep.passed else ("SKIPPED" if rep.skipped else "FAILED")
+            dur_ms = int(rep.duration * 1000)
+            print(f"[TEACH] ▶ Result: {status} ({dur_ms} ms) :: {item.nodeid}")
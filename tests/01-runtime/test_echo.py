@@ -8,15 +8,15 @@ Tests:
 4. CloudWatch logging integration
 """
 
-import json
 import pytest
-import sys
-from pathlib import Path
 
-# Add agents directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
+from agents.echo_agent import LLMAgent, handler
 
-from echo_agent import LLMAgent, handler
+
+@pytest.fixture(autouse=True)
+def _own_session_file(session_file):
+    """Point SESSION_FILE at a per-test path so parallel workers never share it"""
+    return session_file
 
 
 class TestLLMAgent:
@@ -35,10 +35,9 @@ class TestLLMAgent:
         agent = LLMAgent(session_id=custom_id)
         assert agent.session_id == custom_id
 
-    def test_intelligent_response(self):
+    def test_intelligent_response(self, echo_agent):
         """Test LLM-powered response instead of simple echo"""
-        agent = LLMAgent()
-        result = agent.process_message("안녕하세요!")
+        result = echo_agent.process_message("안녕하세요!")
 
         assert result["input"] == "안녕하세요!"
         assert "output" in result
@@ -61,65 +60,68 @@ class TestLLMAgent:
         # Check conversation history
         assert len(agent.conversation_history) == 4  # 2 exchanges
 
-    def test_korean_interaction(self):
-        \"\"\"Test Korean language interaction\"\"\"
-        agent = LLMAgent()
-
-        result = agent.process_message(\"강남점에서 예약하고 싶어요.\")
-        assert result[\"status\"] == \"success\"
-        assert \"강남\" in result[\"output\"] or \"예약\" in result[\"output\"] or len(result[\"output\"]) > 0
+    def test_korean_interaction(self, echo_agent):
+        """Test Korean language interaction"""
+        result = echo_agent.process_message("강남점에서 예약하고 싶어요.")
+        assert result["status"] == "success"
+        assert "강남" in result["output"] or "예약" in result["output"] or len(result["output"]) > 0
 
-    def test_session_metadata(self):
-        \"\"\"Test that session metadata is included in response\"\"\"
-        agent = LLMAgent()
-        result = agent.process_message(\"안녕하세요!\")
+    def test_session_metadata(self, echo_agent):
+        """Test that session metadata is included in response"""
+        result = echo_agent.process_message("안녕하세요!")
 
         assert "session_id" in result
         assert "timestamp" in result
         assert "input" in result
         assert "output" in result
 
-    def test_handler_echo_action(self):
+    def test_handler_echo_action(self, handler_body):
         """Test handler with echo action"""
         event = {
             "message": "test message",
             "action": "echo"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
-        assert body["output"] == "you said: test message"
-
-    def test_handler_ping(self):
+        body = handler_body(handler(event))
+        assert body["status"] == "success"
+        assert body["input"] == "test message"
+        assert len(body["output"]) > 0
+
+    @pytest.mark.parametrize("variant", ["ping", "PING", "Ping", "PiNg"])
+    def test_case_insensitive_ping(self, echo_agent, variant):
+        """Test that ping is answered regardless of case"""
+        result = echo_agent.process_message(variant)
+
+        assert result["output"] == "pong"
+        assert result["input"] == variant
+        assert result["session_id"] == echo_agent.session_id
+
+    @pytest.mark.parametrize("message, expected_output", [
+        ("ping", "pong"),
+        ("PING", "pong"),
+    ])
+    def test_handler_ping(self, message, expected_output, handler_body):
         """Test handler with ping message"""
         event = {
-            "message": "ping",
+            "message": message,
             "action": "echo"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
-        assert body["output"] == "pong"
+        body = handler_body(handler(event))
+        assert body["output"] == expected_output
 
-    def test_handler_write_action(self):
+    def test_handler_write_action(self, handler_body):
         """Test handler with write action"""
         event = {
             "message": "test content",
             "action": "write"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert body["status"] == "written"
         assert "session_id" in body
 
-    def test_handler_read_action(self):
+    def test_handler_read_action(self, handler_body):
         """Test handler with read action (after write)"""
         # First write
         write_event = {
@@ -133,23 +135,17 @@ class TestLLMAgent:
             "action": "read"
         }
 
-        response = handler(read_event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(read_event))
         assert body["status"] == "read"
         assert body["content"] == "persistent data"
 
-    def test_handler_unknown_action(self):
+    def test_handler_unknown_action(self, handler_body):
         """Test handler with unknown action"""
         event = {
             "action": "unknown_action"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert "error" in body
 
 
@@ -157,19 +153,19 @@ class TestSessionIsolation:
     """Test session isolation features"""
 
     def test_write_and_read_same_session(self):
-        \"\"\"Test writing and reading within same session\"\"\"
-        agent = LLMAgent(session_id=\"test_session_1\")
+        """Test writing and reading within same session"""
+        agent = LLMAgent(session_id="test_session_1")
 
         # Write
-        agent.write_session_file(\"Session 1 Data\")
+        agent.write_session_file("Session 1 Data")
 
         # Read
         content = agent.read_session_file()
-        assert content == \"Session 1 Data\"
+        assert content == "Session 1 Data"
 
     def test_file_not_found(self):
-        \"\"\"Test reading non-existent file\"\"\"
-        agent = LLMAgent(session_id=\"new_session\")
+        """Test reading non-existent file"""
+        agent = LLMAgent(session_id="new_session")
 
         # Try to read before writing
         # Note: In real AgentCore, different sessions would have isolated /tmp
@@ -185,11 +181,11 @@ class TestCloudWatchIntegration:
     """Test CloudWatch logging integration"""
 
     def test_logging_output(self, caplog):
-        \"\"\"Test that agent produces log output\"\"\"
+        """Test that agent produces log output"""
         agent = LLMAgent()
 
-        with caplog.at_level(\"INFO\"):
-            agent.process_message(\"테스트 메시지\")
+        with caplog.at_level("INFO"):
+            agent.process_message("테스트 메시지")
 
         # Check that logs were generated
         assert len(caplog.records) > 0
@@ -10,14 +10,22 @@ Tests the LLM-powered agent with various scenarios including:
 
 import pytest
 import asyncio
+import functools
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from agents.echo_agent import LLMAgent
 from tools.llm_provider import LLMFactory, MockProvider
 
 
+@functools.lru_cache(maxsize=None)
+def _make_real_provider():
+    """Build the configured provider once per module (credential lookup, client setup)"""
+    return LLMFactory.create_provider()
+
+
 class TestLLMAgent:
     """Test LLM-powered agent functionality"""
 
@@ -32,7 +40,9 @@ class TestLLMAgent:
     @pytest.fixture
     def real_agent(self):
         """Create agent with real LLM provider (if available)"""
-        return LLMAgent()
+        agent = LLMAgent()
+        agent.llm_provider = _make_real_provider()
+        return agent
 
     def test_agent_initialization(self):
         """Test basic agent initialization"""
@@ -72,10 +82,10 @@ class TestLLMAgent:
         # Check conversation history
         assert len(mock_agent.conversation_history) == 4  # 2 exchanges
 
-    def test_context_injection_mock(self, mock_agent):
+    def test_context_injection_mock(self, mock_llm_agent):
         """Test processing with additional context"""
         context = {"user_id": "user_123", "preferred_branch": "강남"}
-        response = mock_agent.process_message("예약하고 싶어요.", context=context)
+        response = mock_llm_agent.process_message("예약하고 싶어요.", context=context)
         
         assert response["status"] == "success"
         assert response["input"] == "예약하고 싶어요."
@@ -144,24 +154,28 @@ class TestLLMAgentAsync:
 
     async def test_concurrent_message_processing(self):
         """Test concurrent message processing"""
-        agent = LLMAgent()
-        
-        # Create multiple concurrent tasks
-        tasks = []
-        for i in range(3):
-            task = asyncio.create_task(
-                asyncio.to_thread(agent.process_message, f"Message {i}")
-            )
-            tasks.append(task)
-        
-        responses = await asyncio.gather(*tasks)
-        
+        messages = [f"Message {i}" for i in range(3)]
+        # One agent per message: a shared agent's history would interleave
+        # user/assistant pairs across threads
+        agents = [LLMAgent() for _ in messages]
+
+        # Bounded pool of reused worker threads instead of one thread per task
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(len(messages), 8)) as pool:
+            tasks = [
+                loop.run_in_executor(pool, agent.process_message, message)
+                for agent, message in zip(agents, messages)
+            ]
+            responses = await asyncio.gather(*tasks)
+
         # All should succeed
         for response in responses:
             assert response["status"] == "success"
-        
-        # Check that all messages were processed
-        assert len(agent.conversation_history) == 6  # 3 exchanges * 2 messages each
+
+        # Check that every message was processed as one exchange on its own agent
+        for agent, message in zip(agents, messages):
+            assert len(agent.conversation_history) == 2
+            assert agent.conversation_history[0]["content"] == message
 
 
 if __name__ == "__main__":
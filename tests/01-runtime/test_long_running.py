@@ -8,21 +8,59 @@ Tests:
 4. Checkpoint persistence
 """
 
-import json
+import asyncio
 import pytest
-import sys
-import time
-from pathlib import Path
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
-# Add agents directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
+from agents import timer_agent
+from agents.timer_agent import TimerAgent, handler
 
-from timer_agent import TimerAgent, handler
+
+class FakeClock:
+    """Virtual clock for timer_agent: sleeping advances time instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._wall_start = datetime.now()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def wall(self) -> datetime:
+        return self._wall_start + timedelta(seconds=self.now)
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Patch timer_agent's monotonic clock, wall clock and sleep with a FakeClock"""
+    clock = FakeClock()
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.wall()
+
+    async def fake_sleep(delay, result=None):
+        clock.advance(max(delay, 0))
+        return result
+
+    monkeypatch.setattr(timer_agent, "time", SimpleNamespace(monotonic=clock.monotonic, sleep=clock.advance))
+    monkeypatch.setattr(timer_agent, "datetime", FakeDatetime)
+    monkeypatch.setattr(timer_agent.asyncio, "sleep", fake_sleep)
+    return clock
 
 
 class TestTimerAgent:
     """Test cases for Timer Agent"""
 
+    @pytest.fixture(autouse=True)
+    def _virtual_time(self, fake_clock):
+        """Run every test of this class on the virtual clock"""
+
     def test_initialization(self):
         """Test agent initialization"""
         agent = TimerAgent()
@@ -31,13 +69,11 @@ class TestTimerAgent:
         assert agent.start_time is not None
         assert len(agent.timestamps) == 0
 
-    def test_initialization_with_custom_session_id(self):
+    def test_initialization_with_custom_session_id(self, session_id):
         """Test agent initialization with custom session ID"""
-        custom_id = "timer_test_123"
-        agent = TimerAgent(session_id=custom_id)
-        assert agent.session_id == custom_id
+        agent = TimerAgent(session_id=session_id)
+        assert agent.session_id == session_id
 
-    @pytest.mark.slow
     def test_short_timed_loop(self):
         """
         Test timed loop with short duration (30 seconds)
@@ -59,23 +95,24 @@ class TestTimerAgent:
         assert result["total_elapsed_seconds"] >= 30
         assert result["total_elapsed_seconds"] < 35  # Allow some overhead
 
-    def test_get_status(self):
+    def test_get_status(self, fake_clock, session_id):
         """Test status retrieval"""
-        agent = TimerAgent(session_id="status_test")
+        agent = TimerAgent(session_id=session_id)
 
         # Small delay to ensure elapsed time > 0
-        time.sleep(0.1)
+        fake_clock.advance(0.1)
 
         status = agent.get_status()
 
-        assert status["session_id"] == "status_test"
+        assert status["session_id"] == session_id
         assert status["status"] == "running"
-        assert status["elapsed_seconds"] > 0
+        assert status["elapsed_seconds"] == pytest.approx(0.1)
         assert status["timestamps_collected"] == 0  # No loop run yet
 
-    @pytest.mark.slow
-    def test_checkpoint_persistence(self, tmp_path):
+    def test_checkpoint_persistence(self, tmp_path, monkeypatch):
         """Test that checkpoints are written to file"""
+        checkpoint_file = tmp_path / "timer_checkpoints.log"
+        monkeypatch.setenv("TIMER_CHECKPOINT", str(checkpoint_file))
         agent = TimerAgent()
 
         # Run very short loop
@@ -85,98 +122,119 @@ class TestTimerAgent:
         )
 
         # Check that checkpoint file exists and has content
-        checkpoint_file = Path("/tmp/timer_checkpoints.log")
-        if checkpoint_file.exists():
-            content = checkpoint_file.read_text()
-            assert len(content) > 0
-            assert "," in content  # CSV format
+        assert checkpoint_file.exists()
+        content = checkpoint_file.read_text()
+        assert len(content) > 0
+        assert "," in content  # CSV format
 
 
-class TestTimerHandler:
-    """Test handler function"""
+@pytest.mark.realclock
+@pytest.mark.slow
+class TestTimerRealClock:
+    """Smoke test on the real clock (nightly runs only)"""
 
-    def test_handler_run_action_quick(self):
+    def test_handler_run_action_quick(self, handler_body):
         """Test handler with run action (quick version)"""
         event = {
             "action": "run",
             "duration_minutes": 0.05,  # 3 seconds
-            "interval_minutes": 0.017  # ~1 second
+            "interval_minutes": 0.017,  # ~1 second
+            "include_timestamps": True
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert body["status"] == "completed"
         assert body["iterations"] >= 2
         assert len(body["timestamps"]) >= 2
 
-    def test_handler_status_action(self):
+
+class TestTimerHandler:
+    """Test handler function"""
+
+    @pytest.fixture(autouse=True)
+    def _virtual_time(self, fake_clock):
+        """Run every test of this class on the virtual clock"""
+
+    def test_handler_status_action(self, session_id, handler_body):
         """Test handler with status action"""
         event = {
-            "session_id": "test_session_status",
+            "session_id": session_id,
             "action": "status"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert body["status"] == "running"
-        assert body["session_id"] == "test_session_status"
+        assert body["session_id"] == session_id
 
-    def test_handler_unknown_action(self):
+    def test_handler_unknown_action(self, handler_body):
         """Test handler with unknown action"""
         event = {
             "action": "invalid_action"
         }
 
-        response = handler(event)
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert "error" in body
 
+    @pytest.mark.parametrize("interval_minutes", [0, -1])
+    def test_handler_rejects_non_positive_interval(self, interval_minutes, handler_body):
+        """Test a non-positive interval is reported as a ValueError instead of crashing the loop"""
+        event = {"action": "run", "duration_minutes": 1, "interval_minutes": interval_minutes}
+
+        body = handler_body(handler(event), expected_status=500)
+        assert body["type"] == "ValueError"
+        assert "interval_minutes" in body["error"]
+
+    def test_handler_called_from_running_loop(self, session_id, handler_body):
+        """Test the sync handler still works when called from async code"""
+        async def call_from_async():
+            return handler({"session_id": session_id, "action": "run", "duration_minutes": 1, "interval_minutes": 1})
+
+        body = handler_body(asyncio.run(call_from_async()))
+        assert body["status"] == "completed"
+        assert body["iterations"] == 1
+
     @pytest.mark.slow
     @pytest.mark.integration
-    def test_handler_full_duration(self):
+    def test_handler_full_duration(self, fake_clock, handler_body):
         """
-        Test handler with realistic duration (5 minutes)
+        Test handler with realistic duration (5 minutes of virtual time)
 
         This test is marked as slow and integration - skip in quick test runs
         """
         event = {
             "action": "run",
             "duration_minutes": 5,
-            "interval_minutes": 1
+            "interval_minutes": 1,
+            "include_timestamps": True
         }
 
-        start_time = time.time()
+        start_time = fake_clock.monotonic()
         response = handler(event)
-        elapsed = time.time() - start_time
+        elapsed = fake_clock.monotonic() - start_time
 
-        assert response["statusCode"] == 200
-
-        body = json.loads(response["body"])
+        body = handler_body(response)
         assert body["status"] == "completed"
         assert body["iterations"] == 5  # Should have 5 iterations
         assert len(body["timestamps"]) == 5
-        assert 300 <= elapsed < 310  # ~5 minutes with some overhead
+        assert elapsed == 300  # exactly 5 minutes of virtual time
 
 
 @pytest.mark.integration
 class TestLongRunningScenarios:
     """Integration tests for long-running scenarios"""
 
-    @pytest.mark.slow
-    def test_session_continuity(self):
+    @pytest.fixture(autouse=True)
+    def _virtual_time(self, fake_clock):
+        """Run every test of this class on the virtual clock"""
+
+    def test_session_continuity(self, session_id):
         """
         Test that session maintains state throughout execution
 
         This simulates the real scenario where a session should not
         be terminated during long-running operations
         """
-        agent = TimerAgent(session_id="continuity_test")
+        agent = TimerAgent(session_id=session_id)
 
         # Record initial state
         initial_session_id = agent.session_id
@@ -193,16 +251,15 @@ class TestLongRunningScenarios:
         assert agent.start_time == initial_start_time
         assert len(agent.timestamps) > 0
 
-    @pytest.mark.slow
-    def test_multiple_status_checks(self):
+    def test_multiple_status_checks(self, fake_clock, session_id):
         """Test status can be checked while agent is running"""
-        agent = TimerAgent(session_id="multi_status_test")
+        agent = TimerAgent(session_id=session_id)
 
         # Get initial status
         status1 = agent.get_status()
         assert status1["timestamps_collected"] == 0
 
-        time.sleep(1)
+        fake_clock.advance(1)
 
         # Run short loop
         agent.run_timed_loop(duration_minutes=0.05, interval_minutes=0.017)
@@ -211,6 +268,8 @@ class TestLongRunningScenarios:
         status2 = agent.get_status()
         assert status2["timestamps_collected"] > 0
         assert status2["elapsed_seconds"] > status1["elapsed_seconds"]
+        # 1s pause + 3s loop, all virtual
+        assert status2["elapsed_seconds"] - status1["elapsed_seconds"] == pytest.approx(1 + 3)
 
 
 if __name__ == "__main__":
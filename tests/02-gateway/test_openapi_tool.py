@@ -10,34 +10,28 @@ Tests:
 
 import json
 import pytest
-import sys
-import yaml
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 import requests
+from requests.adapters import HTTPAdapter
 
-# Add tools directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
+# Calculator service requests: case -> (path, payload)
+_CALCULATOR_REQUESTS = {
+    "add": ("/add", {"a": 3, "b": 5}),
+    "subtract": ("/subtract", {"a": 10, "b": 3}),
+    "multiply": ("/multiply", {"a": 4, "b": 7}),
+    "divide": ("/divide", {"a": 20, "b": 4}),
+    "divide_by_zero": ("/divide", {"a": 10, "b": 0}),
+}
 
 
 class TestCalculatorAPI:
     """Test Calculator API service directly"""
 
-    @pytest.fixture
-    def openapi_spec(self):
-        """Load OpenAPI specification"""
-        spec_path = Path(__file__).parent.parent.parent / "tools" / "openapi" / "calculator_api.yaml"
-        with open(spec_path, 'r') as f:
-            return yaml.safe_load(f)
-
     def test_openapi_spec_valid(self, openapi_spec):
         """Test that OpenAPI spec is valid"""
         assert openapi_spec["openapi"] == "3.0.0"
-        assert "paths" in openapi_spec
-        assert "/add" in openapi_spec["paths"]
-        assert "/subtract" in openapi_spec["paths"]
-        assert "/multiply" in openapi_spec["paths"]
-        assert "/divide" in openapi_spec["paths"]
+        assert {"/add", "/subtract", "/multiply", "/divide"} <= openapi_spec["paths"].keys()
 
     def test_add_operation_schema(self, openapi_spec):
         """Test add operation schema"""
@@ -60,6 +54,11 @@ class TestCalculatorAPI:
 
 
 @pytest.mark.integration
+@pytest.mark.service_tests
+@pytest.mark.skipif(
+    "not config.getoption('--run-service-tests')",
+    reason="Service tests require calculator service to be running"
+)
 class TestCalculatorService:
     """Test Calculator HTTP service"""
 
@@ -68,78 +67,44 @@ class TestCalculatorService:
         """Calculator service URL (assumes service is running)"""
         return "http://localhost:8000/v1"
 
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-service-tests", default=False),
-        reason="Service tests require calculator service to be running"
-    )
-    def test_add_endpoint(self, calculator_url):
-        """Test /add endpoint"""
-        response = requests.post(
-            f"{calculator_url}/add",
-            json={"a": 3, "b": 5}
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["sum"] == 8
-        assert data["operation"] == "addition"
-
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-service-tests", default=False),
-        reason="Service tests require calculator service to be running"
-    )
-    def test_subtract_endpoint(self, calculator_url):
-        """Test /subtract endpoint"""
-        response = requests.post(
-            f"{calculator_url}/subtract",
-            json={"a": 10, "b": 3}
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["result"] == 7
-        assert data["operation"] == "subtraction"
-
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-service-tests", default=False),
-        reason="Service tests require calculator service to be running"
-    )
-    def test_multiply_endpoint(self, calculator_url):
-        """Test /multiply endpoint"""
-        response = requests.post(
-            f"{calculator_url}/multiply",
-            json={"a": 4, "b": 7}
-        )
+    @pytest.fixture(scope="class")
+    def http(self):
+        """Keep-alive HTTP session whose pooled connections are shared by the class"""
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            yield session
 
-        assert response.status_code == 200
-        data = response.json()
-        assert data["product"] == 28
-
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-service-tests", default=False),
-        reason="Service tests require calculator service to be running"
-    )
-    def test_divide_endpoint(self, calculator_url):
-        """Test /divide endpoint"""
-        response = requests.post(
-            f"{calculator_url}/divide",
-            json={"a": 20, "b": 4}
-        )
+    @pytest.fixture(scope="class")
+    def calculator_responses(self, http, calculator_url):
+        """Send every calculator case concurrently over the pooled session"""
+        with ThreadPoolExecutor(max_workers=len(_CALCULATOR_REQUESTS)) as pool:
+            futures = {
+                case: pool.submit(http.post, f"{calculator_url}{path}", json=payload)
+                for case, (path, payload) in _CALCULATOR_REQUESTS.items()
+            }
+            return {case: future.result() for case, future in futures.items()}
+
+    @pytest.mark.parametrize("case, expected", [
+        ("add", {"sum": 8, "operation": "addition"}),
+        ("subtract", {"result": 7, "operation": "subtraction"}),
+        ("multiply", {"product": 28}),
+        ("divide", {"quotient": 5}),
+    ])
+    def test_endpoint(self, calculator_responses, case, expected):
+        """Test /add, /subtract, /multiply and /divide endpoints"""
+        response = calculator_responses[case]
 
         assert response.status_code == 200
         data = response.json()
-        assert data["quotient"] == 5
+        for key, value in expected.items():
+            assert data[key] == value
 
-    @pytest.mark.skipif(
-        not pytest.config.getoption("--run-service-tests", default=False),
-        reason="Service tests require calculator service to be running"
-    )
-    def test_divide_by_zero(self, calculator_url):
+    def test_divide_by_zero(self, calculator_responses):
         """Test division by zero error"""
-        response = requests.post(
-            f"{calculator_url}/divide",
-            json={"a": 10, "b": 0}
-        )
+        response = calculator_responses["divide_by_zero"]
 
         assert response.status_code == 400
         data = response.json()
@@ -200,8 +165,33 @@ class TestGatewayOpenAPIIntegration:
         assert len(generated_tools) >= 2
         assert generated_tools[0]["operation_id"] == "addNumbers"
 
-    @patch('requests.post')
-    def test_agent_invoke_openapi_tool(self, mock_post):
+    @pytest.fixture(scope="class")
+    def calculator_routes(self):
+        """
+        Stub the HTTP transport once for the whole class
+
+        requests still builds the URL and JSON body; only HTTPAdapter.send is
+        replaced, answering from ``{(method, url): (status, body)}``. Tests can
+        register more routes on the returned dict.
+        """
+        routes = {
+            ("POST", "http://localhost:8000/v1/add"): (200, {"sum": 8, "operation": "addition"}),
+        }
+
+        def send(adapter, request, **kwargs):
+            status, body = routes[(request.method, request.url)]
+            response = requests.Response()
+            response.status_code = status
+            response.headers["Content-Type"] = "application/json"
+            response._content = json.dumps(body).encode()
+            response.url = request.url
+            response.request = request
+            return response
+
+        with patch.object(HTTPAdapter, "send", autospec=True, side_effect=send):
+            yield routes
+
+    def test_agent_invoke_openapi_tool(self, calculator_routes):
         """
         Test agent invoking OpenAPI tool through Gateway
 
@@ -212,15 +202,6 @@ class TestGatewayOpenAPIIntegration:
         - Gateway calls API endpoint
         - Returns result to agent
         """
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "sum": 8,
-            "operation": "addition"
-        }
-        mock_post.return_value = mock_response
-
         # Simulate agent's tool call
         tool_input = {"a": 3, "b": 5}
 
@@ -232,6 +213,7 @@ class TestGatewayOpenAPIIntegration:
 
         # Verify
         assert response.status_code == 200
+        assert json.loads(response.request.body) == tool_input
         data = response.json()
         assert data["sum"] == 8
 
@@ -347,15 +329,5 @@ class TestGatewayToolDiscovery:
         assert "calculator_add" in tool_names
 
 
-def pytest_addoption(parser):
-    """Add custom pytest options"""
-    parser.addoption(
-        "--run-service-tests",
-        action="store_true",
-        default=False,
-        help="Run tests that require calculator service to be running"
-    )
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -11,8 +11,16 @@ Tests:
 
 import json
 import pytest
-from typing import Any, Dict
-from pydantic import BaseModel, ValidationError, Field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, ValidationError, Field
+
+from tools import json_utils
+
+try:
+    from hypothesis import given, strategies as st
+except Exception:  # pragma: no cover
+    given = st = None  # type: ignore
 
 
 class ToolParameter(BaseModel):
@@ -25,6 +33,8 @@ class ToolParameter(BaseModel):
 
 class ToolInput(BaseModel):
     """Model for validating tool inputs"""
+    model_config = ConfigDict(frozen=True)
+
     a: float = Field(..., description="First number")
     b: float = Field(..., description="Second number")
 
@@ -35,7 +45,7 @@ class TestSchemaValidation:
     def test_valid_input(self):
         """Test validation with valid input"""
         try:
-            tool_input = ToolInput(a=10, b=5)
+            tool_input = ToolInput.model_validate({"a": 10, "b": 5})
             assert tool_input.a == 10
             assert tool_input.b == 5
         except ValidationError:
@@ -44,7 +54,7 @@ class TestSchemaValidation:
     def test_missing_required_field(self):
         """Test validation fails for missing required field"""
         with pytest.raises(ValidationError) as exc_info:
-            ToolInput(a=10)  # Missing 'b'
+            ToolInput.model_validate({"a": 10})  # Missing 'b'
 
         error = exc_info.value
         assert "b" in str(error)
@@ -52,70 +62,123 @@ class TestSchemaValidation:
     def test_invalid_type(self):
         """Test validation fails for invalid type"""
         with pytest.raises(ValidationError) as exc_info:
-            ToolInput(a="not_a_number", b=5)
+            ToolInput.model_validate({"a": "not_a_number", "b": 5})
 
         error = exc_info.value
         assert "type" in str(error).lower() or "number" in str(error).lower()
 
     def test_type_coercion(self):
         """Test that valid type coercion works"""
-        tool_input = ToolInput(a="10", b="5")  # Strings that can be converted
+        tool_input = ToolInput.model_validate({"a": "10", "b": "5"})  # Strings that can be converted
         assert tool_input.a == 10.0
         assert tool_input.b == 5.0
 
     def test_invalid_type_no_coercion(self):
         """Test that invalid strings cannot be coerced"""
         with pytest.raises(ValidationError):
-            ToolInput(a="abc", b=5)
+            ToolInput.model_validate({"a": "abc", "b": 5})
+
+
+# JSON Schema type name -> accepted Python types
+_TYPE_MAP = {
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict
+}
+
+
+# Sample calculator tool schema; read-only so one instance can be shared across tests
+_CALC_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": MappingProxyType({
+        "a": MappingProxyType({"type": "number", "description": "First number"}),
+        "b": MappingProxyType({"type": "number", "description": "Second number"})
+    }),
+    "required": ("a", "b")
+})
+
+
+# Error message templates, filled with str.format_map
+_TPL_MISSING = "Required parameter '{parameter}' is missing"
+_TPL_UNKNOWN = "Parameter '{parameter}' is not defined in schema"
+_TPL_TYPE_MISMATCH = "Parameter '{parameter}' must be {expected}, got {actual}"
+
+
+class CompiledSchema(NamedTuple):
+    """Parameter schema flattened for validation (see GatewayValidator.compile_schema)"""
+    required: Tuple[str, ...]  # required parameter names in schema order
+    required_set: FrozenSet[str]
+    properties: Dict[str, Optional[str]]  # parameter name -> expected JSON type
 
 
 class GatewayValidator:
     """Simulates AgentCore Gateway validation logic"""
 
+    @staticmethod
+    def compile_schema(schema: Mapping[str, Any]) -> CompiledSchema:
+        """Flatten a parameter schema; compile once where the schema is defined"""
+        properties = schema.get("properties", {})
+        required = tuple(schema.get("required", []))
+        return CompiledSchema(
+            required,
+            frozenset(required),
+            {name: spec.get("type") for name, spec in properties.items()}
+        )
+
     @staticmethod
     def validate_parameters(
         parameters: Dict[str, Any],
-        schema: Dict[str, Any]
+        schema: Union[CompiledSchema, Mapping[str, Any]]
     ) -> Dict[str, Any]:
         """
         Validate parameters against schema
 
         Args:
             parameters: Input parameters
-            schema: Parameter schema
+            schema: Parameter schema, or its compile_schema() result
+                (a raw schema is compiled on every call)
 
         Returns:
             Validation result with errors if any
         """
-        errors = []
-        required = schema.get("required", [])
-        properties = schema.get("properties", {})
-
-        # Check required parameters
-        for req_param in required:
-            if req_param not in parameters:
-                errors.append({
-                    "parameter": req_param,
-                    "error": "MissingRequiredParameter",
-                    "message": f"Required parameter '{req_param}' is missing"
-                })
+        if not isinstance(schema, CompiledSchema):
+            schema = GatewayValidator.compile_schema(schema)
+        required, required_set, properties = schema
+
+        # Set difference runs in C; missing errors are still reported in schema order
+        missing = required_set - parameters.keys()
+        errors = [
+            {
+                "parameter": req_param,
+                "error": "MissingRequiredParameter",
+                "message": _TPL_MISSING.format_map({"parameter": req_param})
+            }
+            for req_param in required if req_param in missing
+        ]
 
-        # Check types
+        # Check types; unknown and mismatched parameters are reported in input order
         for param_name, param_value in parameters.items():
             if param_name not in properties:
                 errors.append({
                     "parameter": param_name,
                     "error": "UnknownParameter",
-                    "message": f"Parameter '{param_name}' is not defined in schema"
+                    "message": _TPL_UNKNOWN.format_map({"parameter": param_name})
                 })
                 continue
 
-            expected_type = properties[param_name].get("type")
+            expected_type = properties[param_name]
             if not GatewayValidator._check_type(param_value, expected_type):
                 errors.append({
                     "parameter": param_name,
                     "error": "TypeMismatch",
-                    "message": f"Parameter '{param_name}' must be {expected_type}, got {type(param_value).__name__}"
+                    "message": _TPL_TYPE_MISMATCH.format_map({
+                        "parameter": param_name,
+                        "expected": expected_type,
+                        "actual": type(param_value).__name__
+                    })
                 })
 
         if errors:
@@ -126,40 +189,33 @@ class GatewayValidator:
 
         return {"valid": True}
 
+    @staticmethod
+    def to_json(result: Dict[str, Any]) -> str:
+        """Serialize a validation result for the gateway response body"""
+        return json_utils.dumps(result)
+
     @staticmethod
     def _check_type(value: Any, expected_type: str) -> bool:
         """Check if value matches expected type"""
-        type_map = {
-            "string": str,
-            "number": (int, float),
-            "integer": int,
-            "boolean": bool,
-            "array": list,
-            "object": dict
-        }
-
-        expected_python_type = type_map.get(expected_type)
-        if expected_python_type is None:
+        try:
+            return isinstance(value, _TYPE_MAP[expected_type])
+        except KeyError:
             return True  # Unknown type, skip validation
 
-        return isinstance(value, expected_python_type)
+
+# Compiled once here instead of on every validate_parameters call
+_CALC_COMPILED = GatewayValidator.compile_schema(_CALC_SCHEMA)
+
+
+@pytest.fixture(scope="session")
+def calculator_schema():
+    """Sample schema for calculator tool, compiled once (read-only, shared by all tests)"""
+    return _CALC_COMPILED
 
 
 class TestGatewayValidator:
     """Test Gateway validation logic"""
 
-    @pytest.fixture
-    def calculator_schema(self):
-        """Sample schema for calculator tool"""
-        return {
-            "type": "object",
-            "properties": {
-                "a": {"type": "number", "description": "First number"},
-                "b": {"type": "number", "description": "Second number"}
-            },
-            "required": ["a", "b"]
-        }
-
     def test_valid_parameters(self, calculator_schema):
         """Test validation passes for valid parameters"""
         params = {"a": 10, "b": 5}
@@ -168,33 +224,19 @@ class TestGatewayValidator:
         assert result["valid"] is True
         assert "errors" not in result
 
-    def test_missing_required_parameter(self, calculator_schema):
-        """Test validation fails for missing required parameter"""
-        params = {"a": 10}
-        result = GatewayValidator.validate_parameters(params, calculator_schema)
-
-        assert result["valid"] is False
-        assert len(result["errors"]) == 1
-        assert result["errors"][0]["parameter"] == "b"
-        assert result["errors"][0]["error"] == "MissingRequiredParameter"
-
-    def test_wrong_type_parameter(self, calculator_schema):
-        """Test validation fails for wrong type"""
-        params = {"a": "not_a_number", "b": 5}
-        result = GatewayValidator.validate_parameters(params, calculator_schema)
-
-        assert result["valid"] is False
-        assert any(e["parameter"] == "a" for e in result["errors"])
-        assert any(e["error"] == "TypeMismatch" for e in result["errors"])
-
-    def test_unknown_parameter(self, calculator_schema):
-        """Test validation fails for unknown parameter"""
-        params = {"a": 10, "b": 5, "c": 15}
+    @pytest.mark.parametrize("params, error, parameter", [
+        pytest.param({"a": 10}, "MissingRequiredParameter", "b", id="missing-b"),
+        pytest.param({"a": "not_a_number", "b": 5}, "TypeMismatch", "a", id="wrong-type"),
+        pytest.param({"a": 10, "b": 5, "c": 15}, "UnknownParameter", "c", id="unknown-c"),
+        # 사용자: "문자열 'abc'와 숫자 2를 더해달라" → calculator_add(a="abc", b=2)
+        pytest.param({"a": "abc", "b": 2}, "TypeMismatch", "a", id="string-in-number"),
+    ])
+    def test_single_error(self, calculator_schema, params, error, parameter):
+        """Test each invalid payload is rejected with exactly one matching error"""
         result = GatewayValidator.validate_parameters(params, calculator_schema)
 
         assert result["valid"] is False
-        assert any(e["parameter"] == "c" for e in result["errors"])
-        assert any(e["error"] == "UnknownParameter" for e in result["errors"])
+        assert [(e["parameter"], e["error"]) for e in result["errors"]] == [(parameter, error)]
 
     def test_multiple_errors(self, calculator_schema):
         """Test validation collects multiple errors"""
@@ -204,6 +246,70 @@ class TestGatewayValidator:
         assert result["valid"] is False
         assert len(result["errors"]) >= 2  # At least type error and missing 'b'
 
+    def test_error_order(self, calculator_schema):
+        """Test missing errors come first, then unknown/type errors in input order"""
+        result = GatewayValidator.validate_parameters({"a": "x", "c": 1}, calculator_schema)
+
+        assert [(e["parameter"], e["error"]) for e in result["errors"]] == [
+            ("b", "MissingRequiredParameter"),
+            ("a", "TypeMismatch"),
+            ("c", "UnknownParameter"),
+        ]
+
+    def test_raw_schema_matches_compiled(self, calculator_schema):
+        """Test a raw schema validates like its compiled form"""
+        for params in ({"a": 1, "b": 2}, {"a": "x", "c": 1}):
+            assert (GatewayValidator.validate_parameters(params, dict(_CALC_SCHEMA))
+                    == GatewayValidator.validate_parameters(params, calculator_schema))
+
+    def test_raw_schema_edits_are_seen(self):
+        """Test in-place edits to a raw schema apply to the next call"""
+        schema = {"type": "object", "properties": {"a": {"type": "number"}, "b": {"type": "number"}}, "required": ["a"]}
+        assert GatewayValidator.validate_parameters({"a": 1}, schema)["valid"] is True
+
+        schema["required"].append("b")
+        result = GatewayValidator.validate_parameters({"a": 1}, schema)
+        assert result["valid"] is False
+        assert result["errors"][0]["parameter"] == "b"
+
+    def test_result_to_json(self, calculator_schema):
+        """Test validation result serializes with readable messages"""
+        result = GatewayValidator.validate_parameters({"a": "x"}, calculator_schema)
+        body = json_utils.loads(GatewayValidator.to_json(result))
+
+        assert body["valid"] is False
+        assert body["errors"] == result["errors"]
+        assert json.loads(json.dumps(result)) == body
+        assert body["errors"][0]["message"] == "Required parameter 'b' is missing"
+        assert body["errors"][1]["message"] == "Parameter 'a' must be number, got str"
+
+
+@pytest.mark.skipif(given is None, reason="hypothesis not installed")
+class TestGatewayValidatorProperties:
+    """Property-based checks of GatewayValidator against the calculator schema"""
+
+    def test_errors_match_schema(self, calculator_schema):
+        """Test generated payloads get exactly the missing/unknown/type errors the schema implies"""
+        values = st.one_of(st.none(), st.booleans(), st.integers(), st.floats(), st.text(), st.lists(st.integers()))
+        names = st.one_of(st.sampled_from(["a", "b", "c"]), st.text(max_size=3))
+
+        @given(params=st.dictionaries(names, values, max_size=5))
+        def check(params):
+            result = GatewayValidator.validate_parameters(params, calculator_schema)
+
+            expected = [(p, "MissingRequiredParameter") for p in ("a", "b") if p not in params]
+            expected += [
+                (p, "UnknownParameter") if p not in ("a", "b") else (p, "TypeMismatch")
+                for p, value in params.items()
+                if p not in ("a", "b") or not isinstance(value, (int, float))
+            ]
+            errors = [(e["parameter"], e["error"]) for e in result.get("errors", [])]
+
+            assert errors == expected
+            assert result["valid"] is (not expected)
+
+        check()
+
 
 class TestAgentErrorHandling:
     """Test how agents handle validation errors"""
@@ -272,7 +378,7 @@ class TestAgentErrorHandling:
         assert "'a'" in user_message
         assert "숫자" in user_message
 
-    def test_agent_retries_with_corrected_parameters(self):
+    def test_agent_retries_with_corrected_parameters(self, calculator_schema):
         """
         Test agent can retry after validation error
 
@@ -283,16 +389,8 @@ class TestAgentErrorHandling:
         """
         # First attempt
         attempt1 = {"a": "abc", "b": 2}
-        schema = {
-            "type": "object",
-            "properties": {
-                "a": {"type": "number"},
-                "b": {"type": "number"}
-            },
-            "required": ["a", "b"]
-        }
 
-        result1 = GatewayValidator.validate_parameters(attempt1, schema)
+        result1 = GatewayValidator.validate_parameters(attempt1, calculator_schema)
         assert result1["valid"] is False
 
         # Agent analyzes error and corrects
@@ -300,55 +398,9 @@ class TestAgentErrorHandling:
         # Here we simulate the correction
         attempt2 = {"a": 10, "b": 2}  # Corrected
 
-        result2 = GatewayValidator.validate_parameters(attempt2, schema)
+        result2 = GatewayValidator.validate_parameters(attempt2, calculator_schema)
         assert result2["valid"] is True
 
 
-class TestValidationScenarios:
-    """Test real-world validation scenarios"""
-
-    def test_scenario_invalid_string_in_number_field(self):
-        """
-        Scenario: User asks "문자열 'abc'와 숫자 2를 더해달라"
-
-        Expected flow:
-        1. Agent tries to call calculator_add(a="abc", b=2)
-        2. Gateway validation fails
-        3. Agent receives validation error
-        4. Agent explains to user that strings cannot be added numerically
-        """
-        tool_input = {"a": "abc", "b": 2}
-        schema = {
-            "type": "object",
-            "properties": {
-                "a": {"type": "number"},
-                "b": {"type": "number"}
-            },
-            "required": ["a", "b"]
-        }
-
-        result = GatewayValidator.validate_parameters(tool_input, schema)
-
-        # Validation should fail
-        assert result["valid"] is False
-
-        # Should have type mismatch error
-        errors = result["errors"]
-        assert any(
-            e["error"] == "TypeMismatch" and e["parameter"] == "a"
-            for e in errors
-        )
-
-        # Agent's response to user
-        agent_response = """
-        죄송합니다. 계산기 API는 숫자 간의 연산만 지원합니다.
-        'abc'는 문자열이므로 숫자 연산에 사용할 수 없습니다.
-        두 개의 숫자를 제공해 주시면 계산해 드리겠습니다.
-        """
-
-        assert "숫자" in agent_response
-        assert "abc" in agent_response
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -190,6 +190,211 @@ class TestLLMMemoryManager:
         latest_session = user_sessions[-1]
         assert latest_session["session_id"] == session_id
 
+    def test_async_turn_processing_mock(self, mock_memory_manager):
+        """Test async extraction is scheduled per turn and awaited at session end"""
+        import asyncio
+
+        session_id = "test_session_async"
+        user_id = "user_async"
+
+        async def run_session():
+            await mock_memory_manager.aprocess_turn(
+                session_id, user_id,
+                "내 이름은 성민이야.",
+                "안녕하세요, 성민님!"
+            )
+            await mock_memory_manager.aprocess_turn(
+                session_id, user_id,
+                "강남점으로 예약하고 싶어요.",
+                "네, 강남점으로 예약 도와드리겠습니다."
+            )
+            session_memory = mock_memory_manager.get_session_memory(session_id)
+            assert len(session_memory.conversation_history) == 2
+            assert len(session_memory.pending_tasks) == 2
+
+            await mock_memory_manager.aend_session(session_id, user_id)
+            assert session_memory.pending_tasks == []
+
+        asyncio.run(run_session())
+
+        long_term = mock_memory_manager.long_term_memory
+        assert long_term.get_user_preference(user_id, "preferred_branch") == "강남"
+        assert long_term.get_user_sessions(user_id)[-1]["session_id"] == session_id
+
+    def test_async_extraction_uses_scheduled_turn(self):
+        """Test that queued async extractions each analyse the turn they were scheduled for"""
+        import asyncio
+
+        class JSONProvider(MockProvider):
+            prompts = []
+
+            async def agenerate(self, prompt, **kwargs):
+                JSONProvider.prompts.append(prompt)
+                last_user_line = [line for line in prompt.splitlines() if line.startswith("사용자: ")][-1]
+                if "성민" in last_user_line:
+                    preferences = {"name": "성민", "preferred_branch": None}
+                else:
+                    preferences = {"name": None, "preferred_branch": "강남"}
+                return json.dumps({"preferences": preferences, "topics": ["general"]}, ensure_ascii=False)
+
+        manager = MemoryManager(llm_provider=JSONProvider())
+        session_id = "scheduled_turn_session"
+        user_id = "scheduled_turn_user"
+
+        async def run_session():
+            # Both turns are queued before either task gets to run
+            await manager.aprocess_turn(session_id, user_id, "내 이름은 성민이야.", "안녕하세요, 성민님!")
+            await manager.aprocess_turn(session_id, user_id, "강남점으로 예약할게요.", "네, 강남점으로 도와드릴게요.")
+            await manager.aend_session(session_id, user_id)
+
+        asyncio.run(run_session())
+
+        assert len(JSONProvider.prompts) == 2
+        assert manager.preference_cache.cache_info().hits == 0
+        long_term = manager.long_term_memory
+        assert long_term.get_user_preference(user_id, "name") == "성민"
+        assert long_term.get_user_preference(user_id, "preferred_branch") == "강남"
+
+    def test_async_extraction_concurrency_limit(self):
+        """Test that concurrent async extraction calls stay within max_concurrency"""
+        import asyncio
+
+        class SlowProvider(MockProvider):
+            in_flight = 0
+            peak = 0
+
+            async def agenerate(self, prompt, **kwargs):
+                SlowProvider.in_flight += 1
+                SlowProvider.peak = max(SlowProvider.peak, SlowProvider.in_flight)
+                await asyncio.sleep(0.01)
+                SlowProvider.in_flight -= 1
+                return '{"name": null, "preferred_branch": "서울", "service_preference": null, "other": null}'
+
+        manager = MemoryManager(llm_provider=SlowProvider(), max_concurrency=2)
+
+        async def run_sessions():
+            for index in range(6):
+                await manager.aprocess_turn(f"limit_session_{index}", "limit_user", f"서울점 {index}번 문의", "네")
+            await asyncio.gather(*(manager.flush_session(f"limit_session_{index}") for index in range(6)))
+
+        asyncio.run(run_sessions())
+
+        assert SlowProvider.peak == 2
+        assert manager.long_term_memory.get_user_preference("limit_user", "preferred_branch") == "서울"
+
+    def test_preference_cache_skips_repeated_llm_calls(self, memory_manager, monkeypatch):
+        """Test that a repeated turn reuses the parsed preference result"""
+        import agents.memory_manager
+
+        class JSONProvider(MockProvider):
+            calls = 0
+
+            def generate(self, prompt, **kwargs):
+                JSONProvider.calls += 1
+                return '```json\n{"name": "성민", "preferred_branch": "부산", "service_preference": null, "other": null}\n```'
+
+        monkeypatch.setattr(agents.memory_manager, "get_llm_provider", lambda: JSONProvider())
+
+        for session_id in ("cache_session_1", "cache_session_2"):
+            memory_manager.process_turn(session_id, "cache_user", "내 이름은 성민이야.", "안녕하세요, 성민님!")
+
+        assert JSONProvider.calls == 1
+        assert memory_manager.get_session_memory("cache_session_2").get_context("user_name") == "성민"
+        assert memory_manager.long_term_memory.get_user_preference("cache_user", "preferred_branch") == "부산"
+
+        info = memory_manager.cache_info()["preferences"]
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_topic_cache_is_per_manager(self):
+        """Test that managers with different providers never share cached topics"""
+        class TopicProvider(MockProvider):
+            def __init__(self, topics):
+                super().__init__()
+                self.topics = topics
+
+            def generate(self, prompt, **kwargs):
+                return json.dumps(self.topics)
+
+        summaries = []
+        for topics in (["complaint"], ["compliment"]):
+            manager = MemoryManager(llm_provider=TopicProvider(topics))
+            session_memory = manager.get_session_memory("same_turns_session")
+            session_memory.add_turn("지난번 상담 어땠는지 말씀드릴게요", "네, 말씀해 주세요")
+            summaries.append(session_memory.summarize()["recent_topics"])
+
+        assert summaries == [["complaint"], ["compliment"]]
+
+    def test_fused_extraction_reuses_topics(self, memory_manager, monkeypatch):
+        """Test that per-turn extraction topics are reused by end_session"""
+        import agents.memory_manager
+
+        class FusedProvider(MockProvider):
+            calls = 0
+
+            def generate(self, prompt, **kwargs):
+                FusedProvider.calls += 1
+                return json.dumps({
+                    "preferences": {"name": "박지훈", "preferred_branch": "부산", "service_preference": None, "other": None},
+                    "topics": ["user_identity", "location_preference"]
+                }, ensure_ascii=False)
+
+        monkeypatch.setattr(agents.memory_manager, "get_llm_provider", lambda: FusedProvider())
+
+        session_id = "fused_session"
+        user_id = "fused_user"
+        memory_manager.process_turn(
+            session_id, user_id,
+            "저는 박지훈이고 부산점을 주로 이용해요.",
+            "안녕하세요, 박지훈님!"
+        )
+        memory_manager.end_session(session_id, user_id)
+
+        assert FusedProvider.calls == 1
+        assert memory_manager.long_term_memory.get_user_preference(user_id, "name") == "박지훈"
+        latest_session = memory_manager.long_term_memory.get_user_sessions(user_id)[-1]
+        assert latest_session["summary"]["recent_topics"] == ["user_identity", "location_preference"]
+
+    def test_batched_extraction_single_llm_call(self, monkeypatch):
+        """Test that buffered turns are extracted with one LLM call per batch"""
+        import agents.memory_manager
+
+        class BatchProvider(MockProvider):
+            prompts = []
+
+            def generate(self, prompt, **kwargs):
+                BatchProvider.prompts.append(prompt)
+                return json.dumps({
+                    "preferences": {"name": "이서연", "preferred_branch": "대전", "service_preference": None, "other": None},
+                    "topics": ["user_identity", "location_preference"]
+                }, ensure_ascii=False)
+
+        monkeypatch.setattr(agents.memory_manager, "get_llm_provider", lambda: BatchProvider())
+        manager = MemoryManager(extraction_batch_size=3)
+
+        session_id = "batch_session"
+        user_id = "batch_user"
+        turns = [
+            ("저는 이서연이에요. 배치 추출 확인용입니다.", "안녕하세요, 이서연님!"),
+            ("대전점을 주로 이용해요.", "대전점으로 기억하겠습니다."),
+            ("다음 주 예약 가능할까요?", "확인해 드리겠습니다."),
+            ("오후 시간이 좋아요.", "오후로 알아보겠습니다."),
+        ]
+        for user_input, agent_response in turns[:3]:
+            manager.process_turn(session_id, user_id, user_input, agent_response)
+
+        assert len(BatchProvider.prompts) == 1
+        assert "이서연" in BatchProvider.prompts[0] and "다음 주 예약" in BatchProvider.prompts[0]
+        assert manager.long_term_memory.get_user_preference(user_id, "preferred_branch") == "대전"
+
+        # The partially filled batch is extracted when the session ends
+        manager.process_turn(session_id, user_id, *turns[3])
+        assert len(BatchProvider.prompts) == 1
+        manager.end_session(session_id, user_id)
+
+        assert len(BatchProvider.prompts) == 2
+        assert manager.get_session_memory(session_id).pending_extraction == []
+
     def test_user_context_retrieval(self, mock_memory_manager):
         """Test user context retrieval for new sessions"""
         user_id = "context_test_user"
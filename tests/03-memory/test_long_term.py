@@ -9,12 +9,23 @@ Tests:
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
+from agents.memory_manager import LongTermMemory, MemoryManager
+from tools.preference_store import SQLiteStore
 
-from memory_manager import LongTermMemory, MemoryManager
+
+class FlakyStore(SQLiteStore):
+    """SQLite store whose first ``failures`` loads raise, like a briefly unreachable backend"""
+
+    def __init__(self, failures: int = 1):
+        super().__init__()
+        self.failures = failures
+
+    def load_user(self, user_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store unavailable")
+        return super().load_user(user_id)
 
 
 class TestLongTermMemory:
@@ -23,9 +34,21 @@ class TestLongTermMemory:
     def test_initialization(self):
         """Test memory initialization"""
         memory = LongTermMemory()
-        assert len(memory.user_profiles) == 0
+        with pytest.deprecated_call():
+            assert len(memory.user_profiles) == 0
         assert len(memory.user_sessions) == 0
 
+    def test_user_profiles_is_read_only(self):
+        """Test the deprecated user_profiles view rejects writes instead of dropping them"""
+        memory = LongTermMemory()
+        memory.save_user_preference("user_1", "name", "성민")
+
+        with pytest.deprecated_call():
+            profiles = memory.user_profiles
+        assert profiles["user_1"]["preferences"]["name"]["value"] == "성민"
+        with pytest.raises(TypeError):
+            profiles["user_2"] = {}
+
     def test_save_user_preference(self):
         """Test saving user preference"""
         memory = LongTermMemory()
@@ -120,6 +143,99 @@ class TestLongTermMemory:
         assert sessions[0]["session_id"] == "session_15"
 
 
+class TestPreferenceStore:
+    """Test write-behind persistence of preferences"""
+
+    def test_flush_coalesces_and_persists(self):
+        """Test that buffered writes are coalesced per key and survive a new instance"""
+        from tools.preference_store import SQLiteStore
+
+        store = SQLiteStore()
+        memory = LongTermMemory(store)
+
+        memory.save_user_preference("user_1", "preferred_branch", "강남")
+        memory.save_user_preference("user_1", "preferred_branch", "부산")
+        memory.save_user_preference("user_1", "name", "성민")
+        assert store.load_user("user_1") == {}
+
+        assert memory.flush() == 2
+        assert memory.flush() == 0
+
+        restored = LongTermMemory(store)
+        assert restored.get_user_preference("user_1", "preferred_branch") == "부산"
+        assert restored.get_user_profile("user_1")["preferences"]["name"]["value"] == "성민"
+
+    def test_failed_flush_keeps_bounded_retry_queue(self):
+        """Test that failed flushes re-queue writes, keep newer values and drop the oldest past the cap"""
+        from tools.preference_store import PreferenceStore
+
+        class FailingStore(PreferenceStore):
+            def write_batch(self, records):
+                raise ConnectionError("store unavailable")
+
+            def load_user(self, user_id):
+                return {}
+
+        memory = LongTermMemory(FailingStore(), max_pending_writes=2)
+        memory.save_user_preference("user_1", "name", "성민")
+        memory.save_user_preference("user_1", "preferred_branch", "강남")
+        assert memory.flush() == 0
+
+        memory.save_user_preference("user_1", "preferred_branch", "부산")
+        memory.save_user_preference("user_1", "service_preference", "야간")
+        assert memory.flush() == 0
+
+        assert memory._pending_writes.keys() == {("user_1", "preferred_branch"), ("user_1", "service_preference")}
+        assert memory._pending_writes[("user_1", "preferred_branch")][0] == "부산"
+        assert memory._flush_failures == 2
+
+    def test_failed_load_is_retried(self):
+        """Test that a transient load failure does not hide the user's stored preferences"""
+        store = FlakyStore()
+        store.write_batch([("user_1", "name", "성민", "2025-01-01T00:00:00")])
+        memory = LongTermMemory(store)
+
+        assert memory.get_user_preference("user_1", "name") is None
+        assert memory.get_user_preference("user_1", "name") == "성민"
+
+        memory.save_user_preference("user_1", "preferred_branch", "강남")
+        assert memory.get_user_profile("user_1")["created_at"] == "2025-01-01T00:00:00"
+
+    def test_saves_during_outage_merge_with_stored_values(self):
+        """Test that values saved while the store is down win over, and keep, the stored ones"""
+        store = FlakyStore()
+        store.write_batch([
+            ("user_1", "name", "성민", "2025-01-01T00:00:00"),
+            ("user_1", "preferred_branch", "부산", "2025-01-01T00:00:00"),
+        ])
+        memory = LongTermMemory(store)
+
+        memory.save_user_preference("user_1", "preferred_branch", "강남")
+        profile = memory.get_user_profile("user_1")
+
+        assert profile["created_at"] == "2025-01-01T00:00:00"
+        assert profile["preferences"]["name"]["value"] == "성민"
+        assert profile["preferences"]["preferred_branch"]["value"] == "강남"
+
+    def test_manager_store_is_opt_in(self, monkeypatch):
+        """Test that MEMORY_BACKEND alone does not attach a store to MemoryManager"""
+        monkeypatch.setenv("MEMORY_BACKEND", "sqlite")
+
+        assert MemoryManager().long_term_memory.store is None
+
+    def test_end_session_flushes_store(self):
+        """Test that ending a session writes the session's preferences"""
+        from tools.preference_store import SQLiteStore
+
+        store = SQLiteStore()
+        manager = MemoryManager(preference_store=store)
+
+        manager.process_turn("session_1", "user_1", "부산점으로 해주세요", "부산점 선호도를 기억하겠습니다")
+        manager.end_session("session_1", "user_1")
+
+        assert store.load_user("user_1")["preferred_branch"][0] == "부산"
+
+
 class TestLongTermMemoryScenarios:
     """Test real-world scenarios"""
 
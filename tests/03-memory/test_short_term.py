@@ -8,13 +8,11 @@ Tests:
 4. Turn management
 """
 
-import pytest
-import sys
-from pathlib import Path
+import json
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
+import pytest
 
-from memory_manager import ShortTermMemory, MemoryManager
+from agents.memory_manager import ShortTermMemory, MemoryManager
 
 
 class TestShortTermMemory:
@@ -39,6 +37,22 @@ class TestShortTermMemory:
         assert turn["agent"] == "Hi there!"
         assert "timestamp" in turn
 
+    def test_turn_record_fields(self):
+        """Test turn records expose attributes and convert back to dicts"""
+        memory = ShortTermMemory("test_session")
+
+        memory.add_turn("Hello", "Hi there!", {"channel": "web"})
+        turn = memory.conversation_history[0]
+
+        assert turn.user == "Hello"
+        assert turn.agent == "Hi there!"
+        assert turn.to_dict() == {
+            "timestamp": turn.timestamp,
+            "user": "Hello",
+            "agent": "Hi there!",
+            "metadata": {"channel": "web"}
+        }
+
     def test_multiple_turns(self):
         """Test multiple conversation turns"""
         memory = ShortTermMemory("test_session")
@@ -71,6 +85,7 @@ class TestShortTermMemory:
         assert len(recent) == 3
         assert recent[0]["user"] == "Message 7"
         assert recent[2]["user"] == "Message 9"
+        assert json.loads(json.dumps(recent))[0]["agent"] == "Response 7"
 
     def test_extract_information(self):
         """Test extracting contextual information"""
@@ -94,6 +109,22 @@ class TestShortTermMemory:
         assert context["key1"] == "value1"
         assert context["key2"] == "value2"
 
+    def test_summary_falls_back_to_rule_based_topics(self):
+        """Test that without the LLM, topics come from user turns, once each, in keyword order"""
+        from tools.llm_provider import MockProvider
+
+        class FailingProvider(MockProvider):
+            def generate(self, prompt, **kwargs):
+                raise ConnectionError("LLM unavailable")
+
+        memory = ShortTermMemory("test_session", llm_provider=FailingProvider())
+
+        memory.add_turn("부산점에 가고 싶어요", "네")
+        memory.add_turn("내 이름은 성민이야. 예약할래", "강남점도 있어요")
+        memory.add_turn("강", "남")  # keywords never span turns
+
+        assert memory.summarize()["recent_topics"] == ["user_identity", "appointment", "location_preference"]
+
 
 class TestShortTermMemoryScenarios:
     """Test real-world scenarios"""
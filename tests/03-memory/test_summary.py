@@ -9,12 +9,8 @@ Tests:
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
-
-from memory_manager import ShortTermMemory, MemoryManager
+from agents.memory_manager import ShortTermMemory, MemoryManager
 
 
 class TestMemorySummarization:
@@ -59,6 +55,28 @@ class TestMemorySummarization:
         assert "recent_topics" in summary
         # Should detect topics like "appointment" and "location_preference"
 
+    def test_topics_reused_until_new_turn(self):
+        """Test that summarize() only re-extracts topics after a new turn"""
+        from tools.llm_provider import MockProvider
+
+        class CountingProvider(MockProvider):
+            calls = 0
+
+            def generate(self, prompt, **kwargs):
+                CountingProvider.calls += 1
+                return '["appointment"]'
+
+        memory = ShortTermMemory("topic_cache_session", llm_provider=CountingProvider())
+
+        memory.add_turn("예약하고 싶어요", "첫 답변")
+        assert memory.summarize()["recent_topics"] == ["appointment"]
+        assert memory.summarize()["recent_topics"] == ["appointment"]
+        assert CountingProvider.calls == 1
+
+        memory.add_turn("강남점으로 해주세요", "두 번째 답변")
+        memory.summarize()
+        assert CountingProvider.calls == 2
+
     def test_scenario_long_conversation_summary(self):
         """
         Scenario: 긴 대화 요약
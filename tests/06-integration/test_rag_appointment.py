@@ -5,12 +5,8 @@ Complete end-to-end test combining all AgentCore features
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "agents"))
-
-from memory_manager import MemoryManager
+from agents.memory_manager import MemoryManager
 
 
 class MockRAGSystem:
@@ -3,10 +3,6 @@ Tool Integration & Q&A Process Validation Tests
 실제 도구 호출 및 질의응답 프로세스 검증 테스트
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import pytest
 import json
 import time
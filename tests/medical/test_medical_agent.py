@@ -13,10 +13,7 @@ import json
 import os
 from datetime import datetime, timedelta
 
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
-from agents.medical_agent import MedicalAgent, handler
+from agents.medical_agent import MedicalAgent, handler, _agent_pool
 from tools.llm_provider import MockProvider
 
 
@@ -120,6 +117,47 @@ class TestMedicalAgent:
             urgency = mock_medical_agent._assess_urgency(message)
             assert urgency == expected_urgency
 
+    def test_patient_info_block_single_call(self, mock_medical_agent):
+        """응답에 포함된 환자 정보 블록으로 추가 LLM 호출 없이 컨텍스트 갱신"""
+        class BlockProvider(MockProvider):
+            def chat(self, messages, **kwargs):
+                return (
+                    "내과 진료를 권해 드립니다.\n"
+                    '<patient_info>{"age": 35, "gender": "남성", "symptoms": ["두통"]}</patient_info>'
+                )
+
+            def generate(self, prompt, **kwargs):
+                raise AssertionError("환자 정보 추출용 추가 호출이 발생했습니다")
+
+        mock_medical_agent.llm_provider = BlockProvider()
+        result = mock_medical_agent.process_message("머리가 아파요")
+
+        assert result["status"] == "success"
+        assert result["output"] == "내과 진료를 권해 드립니다."
+        assert result["department_recommended"] == "내과"
+        assert mock_medical_agent.patient_context["gender"] == "남성"
+        assert mock_medical_agent.patient_context["symptoms"] == ["두통"]
+
+    def test_truncated_patient_info_block(self, mock_medical_agent):
+        """닫히지 않은(잘린) 환자 정보 블록은 응답과 히스토리에서 제거하고 별도 추출로 대체"""
+        class TruncatedProvider(MockProvider):
+            fallback_calls = 0
+
+            def chat(self, messages, **kwargs):
+                return '내과를 권합니다.\n<patient_info>{"age": 35, "symptoms": ["두'
+
+            def generate(self, prompt, **kwargs):
+                TruncatedProvider.fallback_calls += 1
+                return "{}"
+
+        mock_medical_agent.llm_provider = TruncatedProvider()
+        result = mock_medical_agent.process_message("머리가 아파요")
+
+        assert result["status"] == "success"
+        assert result["output"] == "내과를 권합니다."
+        assert mock_medical_agent.conversation_history[-1]["content"] == "내과를 권합니다."
+        assert TruncatedProvider.fallback_calls == 1
+
     def test_appointment_availability(self, mock_medical_agent):
         """예약 가능 시간 조회 테스트"""
         # 예약 가능한 과
@@ -175,7 +213,7 @@ class TestMedicalAgent:
             print(f"추천 진료과: {result.get('department_recommended', '없음')}")
             print("-" * 60)
 
-    def test_handler_function(self):
+    def test_handler_function(self, handler_body):
         """핸들러 함수 테스트"""
         # 상담 요청
         event = {
@@ -183,10 +221,7 @@ class TestMedicalAgent:
             "action": "consult"
         }
         
-        response = handler(event)
-        assert response["statusCode"] == 200
-        
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert body["status"] == "success"
         
         # 예약 조회 요청
@@ -195,12 +230,21 @@ class TestMedicalAgent:
             "department": "내과"
         }
         
-        response = handler(event)
-        assert response["statusCode"] == 200
-        
-        body = json.loads(response["body"])
+        body = handler_body(handler(event))
         assert "available_slots" in body
 
+    def test_handler_reuses_session_agent(self, handler_body):
+        """같은 session_id의 연속 요청은 대화 히스토리를 가진 에이전트를 재사용"""
+        session_id = f"medical_pool_{datetime.now().timestamp()}"
+        event = {"message": "머리가 아파요", "action": "consult", "session_id": session_id}
+
+        for _ in range(2):
+            handler_body(handler(event))
+
+        agent = _agent_pool.get(session_id)
+        assert agent.session_id == session_id
+        assert len(agent.conversation_history) == 4
+
     def test_conversation_context_continuity(self, medical_agent):
         """대화 컨텍스트 연속성 테스트"""
         # 다중 턴 대화
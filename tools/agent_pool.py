@@ -0,0 +1,84 @@
+"""
+Session-keyed agent reuse for warm Lambda/AgentCore containers.
+
+Handlers used to construct a fresh agent per invocation, losing the
+conversation history and patient context of multi-turn sessions. AgentPool
+keeps recently used agents in an LRU keyed by session_id and drops agents
+that have been idle longer than the TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+class AgentPool:
+    """Thread-safe LRU + TTL cache of agent instances keyed by session_id"""
+
+    def __init__(self, factory: Callable[[Optional[str]], Any], maxsize: int = 128, ttl_seconds: float = 1800):
+        """
+        Args:
+            factory: Called with a session_id (or None) to build a new agent
+            maxsize: Maximum number of cached sessions
+            ttl_seconds: Idle time after which a session's agent is discarded
+        """
+        self._factory = factory
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._agents: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str] = None) -> Any:
+        """
+        Return the cached agent for session_id, creating it if needed.
+
+        Without a session_id a new, uncached agent is returned; one-off calls
+        must not evict the agents of live sessions. The factory runs outside
+        the lock so a slow agent build never blocks other sessions.
+        """
+        if not session_id:
+            return self._factory(None)
+
+        with self._lock:
+            agent = self._touch(session_id, time.monotonic())
+        if agent is not None:
+            return agent
+
+        agent = self._factory(session_id)
+
+        with self._lock:
+            # Another thread may have built the same session meanwhile; keep the first
+            existing = self._touch(session_id, time.monotonic())
+            if existing is not None:
+                return existing
+            self._agents[session_id] = (time.monotonic(), agent)
+            while len(self._agents) > self._maxsize:
+                self._agents.popitem(last=False)
+            return agent
+
+    def clear(self) -> None:
+        """Drop all cached agents"""
+        with self._lock:
+            self._agents.clear()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def _touch(self, session_id: str, now: float) -> Optional[Any]:
+        # Caller holds the lock; refreshes and returns the cached agent, if any
+        self._evict_expired(now)
+        entry = self._agents.get(session_id)
+        if entry is None:
+            return None
+        self._agents[session_id] = (now, entry[1])
+        self._agents.move_to_end(session_id)
+        return entry[1]
+
+    def _evict_expired(self, now: float) -> None:
+        # Entries are ordered by last use, so stale ones are at the front
+        while self._agents:
+            last_used, _ = next(iter(self._agents.values()))
+            if now - last_used < self._ttl:
+                break
+            self._agents.popitem(last=False)
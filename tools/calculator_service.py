@@ -7,11 +7,17 @@ Can be run locally for testing Gateway integration
 
 import json
 import logging
+import os
+import sys
 from typing import Any, Dict
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
 
-logging.basicConfig(level=logging.INFO)
+# Ensure project root is on sys.path when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from tools import json_utils
+from tools.logging_setup import configure_logging
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,11 +26,13 @@ class CalculatorHandler(BaseHTTPRequestHandler):
 
     def _send_json_response(self, status_code: int, data: Dict[str, Any]) -> None:
         """Send JSON response"""
+        body = json_utils.dumps_bytes(data)
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
     def _send_error_response(self, status_code: int, error_type: str, message: str) -> None:
         """Send error response"""
@@ -37,7 +45,7 @@ class CalculatorHandler(BaseHTTPRequestHandler):
         """Parse JSON request body"""
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length)
-        return json.loads(body.decode())
+        return json_utils.loads(body)
 
     def do_OPTIONS(self):
         """Handle CORS preflight"""
@@ -175,4 +183,5 @@ def run_server(port: int = 8000):
 
 
 if __name__ == "__main__":
+    configure_logging()
     run_server()
@@ -0,0 +1,50 @@
+"""
+Shared JSON helpers for agent handlers.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so every agent serializes through a single import site.
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Leading ```/```json and trailing ``` fences around an LLM JSON answer
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize ``obj`` to a compact JSON string, keeping non-ASCII text as-is."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default)
+
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize ``obj`` straight to UTF-8 JSON bytes for transports that write bytes.
+
+    Skips the intermediate ``str`` that ``dumps(...).encode()`` would allocate.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode()
+
+
+def loads(data: Any) -> Any:
+    """Parse a JSON document from ``str`` or ``bytes``.
+
+    Raises ``json.JSONDecodeError`` on malformed input for both backends.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence (```json ... ```) in a single pass."""
+    return _FENCE_RE.sub("", text)
@@ -0,0 +1,47 @@
+"""
+Multi-keyword substring matching.
+
+Builds an Aho-Corasick automaton (pyahocorasick) once so a text is scanned
+in a single pass regardless of how many keywords are registered. When the
+package is not installed, falls back to per-keyword substring checks.
+"""
+
+from typing import Iterable, List, Tuple
+
+try:
+    import ahocorasick
+except Exception:  # pragma: no cover
+    ahocorasick = None  # type: ignore
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text."""
+
+    def __init__(self, keywords: Iterable[str]):
+        # Keep declaration order (and drop duplicates) so results are stable
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(keywords))
+        self._automaton = None
+
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for index, keyword in enumerate(self.keywords):
+                automaton.add_word(keyword, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> List[str]:
+        """Return every keyword contained in ``text``, in declaration order."""
+        if self._automaton is None:
+            return [kw for kw in self.keywords if kw in text]
+
+        indices = {index for _, index in self._automaton.iter(text)}
+        return [self.keywords[index] for index in sorted(indices)]
+
+    def contains_any(self, text: str) -> bool:
+        """Return True as soon as any keyword is found in ``text``."""
+        if self._automaton is None:
+            return any(kw in text for kw in self.keywords)
+
+        for _ in self._automaton.iter(text):
+            return True
+        return False
@@ -5,11 +5,13 @@ Supports multiple LLM providers (OpenAI, Bedrock) with a common interface.
 Provider selection via environment variables or explicit configuration.
 """
 
+import asyncio
 import os
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,30 @@ class LLMProvider(ABC):
         """Chat completion with message history"""
         pass
 
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> str:
+        """Async text completion
+
+        Runs the blocking ``generate`` in a worker thread by default so several
+        completions can be awaited concurrently from an event loop. Providers
+        with a native async client can override this.
+        """
+        return await asyncio.to_thread(
+            self.generate,
+            prompt,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -300,13 +326,20 @@ class LLMFactory:
 
 # Convenience singleton for global access
 _default_provider: Optional[LLMProvider] = None
+_default_provider_lock = threading.Lock()
 
 
 def get_llm_provider() -> LLMProvider:
-    """Get or create default LLM provider"""
+    """Get or create default LLM provider
+
+    The provider (and its HTTP/boto3 client) is created once per process and
+    reused across handler invocations on warm containers.
+    """
     global _default_provider
     if _default_provider is None:
-        _default_provider = LLMFactory.create_provider()
+        with _default_provider_lock:
+            if _default_provider is None:
+                _default_provider = LLMFactory.create_provider()
     return _default_provider
 
 
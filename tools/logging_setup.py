@@ -0,0 +1,54 @@
+"""
+Logging setup shared by the agent modules.
+
+Log records are put on an in-memory queue by a QueueHandler and written out
+by a QueueListener background thread, so request handling never blocks on
+stdout (CloudWatch) or file I/O.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(log_file: Optional[str] = None, level: int = logging.INFO) -> None:
+    """
+    Install queue-backed root logging once per process.
+
+    Does nothing if the root logger already has handlers (e.g. configured by
+    the host runtime, pytest, or another agent module).
+
+    Args:
+        log_file: Local log file path, only used when LOCAL_LOG_FILE is set
+        level: Root logger level
+    """
+    global _listener
+
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file and os.getenv("LOCAL_LOG_FILE"):
+        handlers.append(logging.FileHandler(log_file))
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(_listener.stop)
@@ -0,0 +1,150 @@
+"""
+Persistent backends for LongTermMemory user preferences.
+
+LongTermMemory hands preference writes to a store in batches (write-behind),
+so saving a preference never waits on storage I/O. Reads are served from
+memory once a user's stored preferences have been loaded, which happens
+synchronously on that user's first access.
+
+Persistence is opt-in: pass a store to ``MemoryManager(preference_store=...)``.
+``create_preference_store()`` builds the one selected with MEMORY_BACKEND:
+
+- ``sqlite``: local SQLite file (MEMORY_DB_PATH, in-memory by default)
+- ``dynamodb``: DynamoDB table MEMORY_TABLE_NAME via boto3's batch_writer
+- unset/``memory``: no persistence
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from tools import json_utils
+
+try:
+    import boto3
+except Exception:  # pragma: no cover
+    boto3 = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# (user_id, key, value, updated_at)
+PreferenceRecord = Tuple[str, str, Any, str]
+
+
+class PreferenceStore:
+    """Interface of a user preference backend"""
+
+    def write_batch(self, records: Iterable[PreferenceRecord]) -> None:
+        """Upsert preference records in as few round-trips as the backend allows"""
+        raise NotImplementedError
+
+    def load_user(self, user_id: str) -> Dict[str, Tuple[Any, str]]:
+        """Return ``{key: (value, updated_at)}`` for one user"""
+        raise NotImplementedError
+
+
+class SQLiteStore(PreferenceStore):
+    """SQLite-backed preference store (one upsert transaction per batch)"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_preferences ("
+                " user_id TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL,"
+                " PRIMARY KEY (user_id, key))"
+            )
+
+    def write_batch(self, records: Iterable[PreferenceRecord]) -> None:
+        rows = [(user_id, key, json_utils.dumps(value), updated_at) for user_id, key, value, updated_at in records]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO user_preferences (user_id, key, value, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (user_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                rows
+            )
+
+    def load_user(self, user_id: str) -> Dict[str, Tuple[Any, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, updated_at FROM user_preferences WHERE user_id = ?",
+                (user_id,)
+            ).fetchall()
+        return {key: (json_utils.loads(value), updated_at) for key, value, updated_at in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class DynamoDBStore(PreferenceStore):
+    """
+    DynamoDB-backed preference store
+
+    Table schema: partition key ``user_id`` (S), sort key ``pref_key`` (S).
+    Values are stored as JSON strings so floats and nested objects round-trip.
+    """
+
+    def __init__(self, table_name: str, region: Optional[str] = None):
+        if boto3 is None:
+            raise RuntimeError("boto3 package required. Install with: pip install boto3>=1.34.0")
+
+        region = region or os.getenv("AWS_REGION", "us-east-1")
+        self._table = boto3.resource("dynamodb", region_name=region).Table(table_name)
+
+    def write_batch(self, records: Iterable[PreferenceRecord]) -> None:
+        # batch_writer groups puts into BatchWriteItem calls of up to 25 items
+        # and retries unprocessed items
+        with self._table.batch_writer(overwrite_by_pkeys=["user_id", "pref_key"]) as batch:
+            for user_id, key, value, updated_at in records:
+                batch.put_item(Item={
+                    "user_id": user_id,
+                    "pref_key": key,
+                    "value": json_utils.dumps(value),
+                    "updated_at": updated_at
+                })
+
+    def load_user(self, user_id: str) -> Dict[str, Tuple[Any, str]]:
+        from boto3.dynamodb.conditions import Key
+
+        preferences: Dict[str, Tuple[Any, str]] = {}
+        query = {"KeyConditionExpression": Key("user_id").eq(user_id)}
+        while True:
+            response = self._table.query(**query)
+            for item in response.get("Items", []):
+                preferences[item["pref_key"]] = (json_utils.loads(item["value"]), item["updated_at"])
+            if "LastEvaluatedKey" not in response:
+                return preferences
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def create_preference_store() -> Optional[PreferenceStore]:
+    """
+    Create the preference store configured by MEMORY_BACKEND
+
+    Returns None (memory only) when no backend is configured or it cannot be
+    created, so local runs without AWS credentials keep working.
+    """
+    backend = os.getenv("MEMORY_BACKEND", "").lower()
+    try:
+        if backend == "sqlite":
+            return SQLiteStore(os.getenv("MEMORY_DB_PATH") or ":memory:")
+        if backend == "dynamodb":
+            return DynamoDBStore(os.getenv("MEMORY_TABLE_NAME", "agentcore-memory"))
+    except Exception as e:
+        logger.warning("Preference store '%s' unavailable, keeping preferences in memory only: %s", backend, e)
+        return None
+
+    if backend not in ("", "memory"):
+        logger.warning("Unknown MEMORY_BACKEND: %s", backend)
+    return None
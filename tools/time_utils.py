@@ -0,0 +1,32 @@
+"""
+Timestamp helpers for agent responses.
+"""
+
+import time
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the most recent call; swapped as one tuple
+_second_cache = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Current local time formatted like ``datetime.now().isoformat()``.
+
+    Reads ``time.time_ns()`` and only re-formats the date/time prefix when the
+    second changes, so most calls just append the microsecond part.
+    """
+    global _second_cache
+
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _second_cache = (second, prefix)
+    return f"{prefix}.{micros:06d}"
+
+
+def iso_from_ns(timestamp_ns: int) -> str:
+    """Format a ``time.time_ns()`` value the same way as ``now_iso()``."""
+    second, micros = divmod(timestamp_ns // 1000, 1_000_000)
+    prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+    return f"{prefix}.{micros:06d}"